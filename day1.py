@@ -1,6 +1,11 @@
+import io
 import sys
 from typing import Counter
 
+from inputcache import cached_parse
+from numeric import np, require_numpy
+from stream import input_lines
+
 
 def read_input() -> str:   
     if len(sys.argv) > 1:
@@ -12,6 +17,7 @@ def read_input() -> str:
     return data
 
 
+@cached_parse
 def parse_lists(data: str) -> tuple[list[int], list[int]]:
     l1, l2 = [], []
     for line in data.splitlines():
@@ -51,6 +57,89 @@ def part_2():
     print("Answer: ", s)
 
 
+# Streaming variants: rather than two full lists, only keep how often each
+# value appears on either side. Memory is bounded by the number of distinct
+# values (at most 100,000 for five-digit location IDs) rather than the length
+# of the input.
+
+
+def count_lists(lines) -> tuple[Counter[int], Counter[int]]:
+    left, right = Counter(), Counter()
+    for line in lines:
+        v1, v2 = map(int, line.split())
+        left[v1] += 1
+        right[v2] += 1
+    return left, right
+
+
+def distance_between_counts(left: Counter[int], right: Counter[int]) -> int:
+    """Same as distance_between_lists, walking both sides' sorted values in runs."""
+    lefts, rights = iter(sorted(left.items())), iter(sorted(right.items()))
+    total = 0
+    a, a_count = next(lefts, (0, 0))
+    b, b_count = next(rights, (0, 0))
+    while a_count and b_count:
+        run = min(a_count, b_count)
+        total += abs(a - b) * run
+        a_count -= run
+        b_count -= run
+        if not a_count:
+            a, a_count = next(lefts, (0, 0))
+        if not b_count:
+            b, b_count = next(rights, (0, 0))
+    return total
+
+
+def similarity_of_counts(left: Counter[int], right: Counter[int]) -> int:
+    return sum(v * n * right[v] for v, n in left.items())
+
+
+def part_1_streaming() -> int:
+    return distance_between_counts(*count_lists(input_lines()))
+
+
+def part_2_streaming() -> int:
+    return similarity_of_counts(*count_lists(input_lines()))
+
+
+# NumPy variants, for inputs with millions of lines.
+
+
+@cached_parse
+def parse_arrays(data: str) -> tuple["np.ndarray", "np.ndarray"]:
+    """Parse straight into two int64 arrays, without any per-line Python work."""
+    require_numpy("the NumPy variants of day 1")
+    if not data.strip():
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    # loadtxt raises ValueError itself if a line has a different number of columns
+    pairs = np.loadtxt(io.StringIO(data), dtype=np.int64, ndmin=2)
+    if pairs.shape[1] != 2:
+        raise ValueError("expected two numbers per line")
+    return pairs[:, 0].copy(), pairs[:, 1].copy()
+
+
+def distance_between_arrays(l1: "np.ndarray", l2: "np.ndarray") -> int:
+    return int(np.abs(np.sort(l1) - np.sort(l2)).sum())
+
+
+def similarity_of_arrays(left: "np.ndarray", right: "np.ndarray") -> int:
+    values, counts = np.unique(right, return_counts=True)
+    if not values.size:
+        return 0
+    # Look every left value up among the distinct right values
+    i = np.minimum(np.searchsorted(values, left), values.size - 1)
+    found = values[i] == left
+    return int((left * counts[i] * found).sum())
+
+
+def part_1_numpy() -> int:
+    return distance_between_arrays(*parse_arrays(read_input()))
+
+
+def part_2_numpy() -> int:
+    return similarity_of_arrays(*parse_arrays(read_input()))
+
+
 if __name__ == "__main__":
     part_2()
 
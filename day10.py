@@ -1,6 +1,10 @@
 import sys
 from collections import defaultdict
 
+from grid import Grid
+from inputcache import cached_parse
+from numeric import np, require_numpy
+
 
 def read_input():
     if len(sys.argv) == 2:
@@ -9,35 +13,31 @@ def read_input():
     return sys.stdin.read().strip()
 
 
-Topo = dict[tuple[int, int], int]
+# Heights are stored as the ASCII digits, so consecutive heights are still
+# consecutive byte values.
+Topo = Grid
+PEAK = ord("9")
 
 
+@cached_parse
 def parse_data(input: str) -> Topo:
-    return {
-        (x, y): int(cell)
-        for y, row in enumerate(input.splitlines())
-        for x, cell in enumerate(row)
-    }
-
-
-def debug_print(data: Topo, trail: list[tuple[int, int]]):
-    max_x, max_y = (
-        max(data, key=lambda pt: pt[0])[0],
-        max(data, key=lambda pt: pt[1])[1],
-    )
-    for y in range(max_y + 1):
-        for x in range(max_x + 1):
-            cell = data[(x, y)]
-            if (x, y) in trail:
-                print(f"\033[91m{cell}\033[0m", end="")
+    return Grid.from_text(input)
+
+
+def debug_print(data: Topo, trail: list[int]):
+    for r in range(data.rows):
+        for c in range(data.cols):
+            i = data.index(r, c)
+            if i in trail:
+                print(f"\033[91m{data[i]}\033[0m", end="")
             else:
-                print(cell, end="")
+                print(data[i], end="")
         print()
 
 
 def find_trailheads(data: Topo):
     """Given a topo map data, find all the 0's."""
-    return [loc for loc, cell in data.items() if cell == 0]
+    return data.find_all("0")
 
 
 def forge_trails(pt, data, trails):
@@ -51,19 +51,19 @@ def forge_trails(pt, data, trails):
 
     The return value should be a list of trails, where each trail is a list of points.
     """
+    cells = data.cells
     # If pt is 9, return itself.
-    if data[pt] == 9:
+    if cells[pt] == PEAK:
         return [[pt]]
     # If pt is already in trails, return it.
     if pt in trails:
         return trails[pt]
     # Otherwise, forge some new trails.
-    for dx, dy in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-        x, y = pt
-        if (x + dx, y + dy) in data:
-            if data[x + dx, y + dy] == data[x, y] + 1:
-                new_trails = forge_trails((x + dx, y + dy), data, trails)
-                trails[pt] += [[pt] + trail for trail in new_trails]
+    for offset in data.offsets:
+        # Padding cells are never one higher than a digit
+        if cells[pt + offset] == cells[pt] + 1:
+            new_trails = forge_trails(pt + offset, data, trails)
+            trails[pt] += [[pt] + trail for trail in new_trails]
     return trails[pt]
 
 
@@ -99,19 +99,187 @@ def do_the_thing(score_func):
     return sum(score_func(th, trails) for th in trailheads)
 
 
-def part1():
+def part1_naive():
     """
     > What is the sum of the scores of all trailheads on your topographic map?
     """
     return do_the_thing(score_trailhead)
 
 
-def part2():
+def part2_naive():
     """
     > What is the sum of the ratings of all trailheads on your topographic map?
     """
     return do_the_thing(rate_trailhead)
 
 
+# Both parts again, without listing every trail. Every step of a trail goes up by
+# exactly 1, so a cell's trails are made of the trails of its neighbours one higher.
+# Working down from the 9s one height at a time, each cell's number of trails (for
+# the rating) is the sum of its higher neighbours', and the set of 9s it can reach
+# (for the score) is the union of theirs, kept as the bits of an int.
+
+
+def heights(data: Topo) -> list[list[int]]:
+    """The positions of each height, 0 to 9"""
+    cells = data.cells
+    levels = [[] for _ in range(10)]
+    for i in data.positions():
+        height = cells[i] - ord("0")
+        if 0 <= height <= 9:
+            levels[height].append(i)
+    return levels
+
+
+def climb(data: Topo, levels: list[list[int]], peaks: list[int], combine) -> list[int]:
+    """
+    Fill in a value for every cell from height 9 down to 0: the 9s get peaks[k], the
+    kth 9's value, and each lower cell combines the values of its neighbours one
+    higher. Cells that aren't part of any trail are left at 0.
+    """
+    cells = data.cells
+    offsets = data.offsets
+    values = [0] * len(cells)
+    for i, value in zip(levels[9], peaks):
+        values[i] = value
+    for height in range(8, -1, -1):
+        for i in levels[height]:
+            higher = cells[i] + 1
+            values[i] = combine(
+                values[i + offset] for offset in offsets if cells[i + offset] == higher
+            )
+    return values
+
+
+def or_all(values) -> int:
+    reach = 0
+    for value in values:
+        reach |= value
+    return reach
+
+
+def trailhead_scores(data: Topo) -> list[int]:
+    levels = heights(data)
+    peaks = [1 << k for k in range(len(levels[9]))]
+    reach = climb(data, levels, peaks, or_all)
+    return [reach[i].bit_count() for i in levels[0]]
+
+
+def trailhead_ratings(data: Topo) -> list[int]:
+    levels = heights(data)
+    trails = climb(data, levels, [1] * len(levels[9]), sum)
+    return [trails[i] for i in levels[0]]
+
+
+def part1():
+    """
+    > What is the sum of the scores of all trailheads on your topographic map?
+    """
+    return sum(trailhead_scores(parse_data(read_input())))
+
+
+def part2():
+    """
+    > What is the sum of the ratings of all trailheads on your topographic map?
+    """
+    return sum(trailhead_ratings(parse_data(read_input())))
+
+
+# NumPy variants of the same climb, one whole height at a time: the cells at each
+# height gather their four neighbours' values at once. Only the height being climbed
+# down from is kept, so a neighbour that isn't exactly one higher just reads a 0.
+#
+# For the scores, a bit per 9 would make the values as wide as there are 9s. But a
+# trail only goes 9 steps, so any two 9s reachable from the same cell are at most 18
+# steps apart, and it's enough to give 9s that close different bits. Numbering them by
+# (row + 19 * col) % 181 does that (it's the perfect Lee code of radius 9: the closest
+# two cells with the same number are 19 steps apart), in 181 bits, 3 uint64 planes.
+#
+# The map is processed in strips of rows, each with 9 extra rows either side so the
+# trails of its trailheads are complete, to bound the memory used.
+
+REACH = 9
+CLASSES = 2 * REACH * REACH + 2 * REACH + 1
+CLASS_STEP = 2 * REACH + 1
+PLANES = -(-CLASSES // 64)
+STRIP_CELLS = 1 << 20  # Roughly how many cells to work on at once
+
+
+def topo_array(data: Topo) -> "np.ndarray":
+    """The padded topo map as a 2D array of its ASCII digits, sharing its memory"""
+    require_numpy("the NumPy variants of day 10")
+    return np.frombuffer(data.cells, dtype=np.uint8).reshape(-1, data.stride)
+
+
+def strips(topo: "np.ndarray"):
+    """
+    Split topo into overlapping windows of rows, yielding each window and the slice of
+    its rows whose trailheads it's responsible for. The first and last row of a window
+    are only ever used as padding.
+    """
+    total = topo.shape[0]
+    size = max(1, STRIP_CELLS // topo.shape[1])
+    for start in range(1, total - 1, size):
+        stop = min(start + size, total - 1)
+        low = max(0, start - REACH - 1)
+        high = min(total, stop + REACH + 1)
+        yield topo[low:high], slice(start - low, stop - low)
+
+
+def climb_arrays(window: "np.ndarray", values: "np.ndarray", combine):
+    """
+    Climb down from the 9s of window, whose cells (flattened) are the last axis of
+    values, combining neighbours with combine (np.add or np.bitwise_or). values starts
+    out set on the 9s and ends up set on the 0s.
+    """
+    flat = window.ravel()
+    width = window.shape[1]
+    above = np.flatnonzero(flat == PEAK)
+    for height in range(PEAK - 1, ord("0") - 1, -1):
+        here = np.flatnonzero(flat[width:-width] == height) + width
+        result = values[..., here - width]
+        for offset in (1, width, -1):
+            combine(result, values[..., here + offset], out=result)
+        values[..., above] = 0
+        values[..., here] = result
+        above = here
+
+
+def count_bits(a: "np.ndarray") -> int:
+    if hasattr(np, "bitwise_count"):
+        return int(np.bitwise_count(a).sum(dtype=np.int64))
+    # NumPy < 2.0: look up the bits of each byte
+    table = np.array([bin(b).count("1") for b in range(256)], dtype=np.int64)
+    return int(table[a.view(np.uint8)].sum())
+
+
+def score_window(window: "np.ndarray", core: slice) -> int:
+    peaks = np.flatnonzero(window.ravel() == PEAK)
+    r, c = np.divmod(peaks, window.shape[1])
+    bit = (r + CLASS_STEP * c) % CLASSES
+    reach = np.zeros((PLANES, window.size), dtype=np.uint64)
+    reach[bit // 64, peaks] = np.left_shift(np.uint64(1), (bit % 64).astype(np.uint64))
+    climb_arrays(window, reach, np.bitwise_or)
+    width = window.shape[1]
+    return count_bits(reach[:, core.start * width : core.stop * width])
+
+
+def rate_window(window: "np.ndarray", core: slice) -> int:
+    trails = (window.ravel() == PEAK).astype(np.int64)
+    climb_arrays(window, trails, np.add)
+    width = window.shape[1]
+    return int(trails[core.start * width : core.stop * width].sum())
+
+
+def part1_numpy():
+    topo = topo_array(parse_data(read_input()))
+    return sum(score_window(window, core) for window, core in strips(topo))
+
+
+def part2_numpy():
+    topo = topo_array(parse_data(read_input()))
+    return sum(rate_window(window, core) for window, core in strips(topo))
+
+
 if __name__ == "__main__":
     print(part2())
@@ -1,5 +1,9 @@
 import sys
-from functools import cache
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Iterator
+
+from numeric import POWERS_OF_TEN, digits, np, require_numpy
 
 
 def read_input():
@@ -13,16 +17,14 @@ def parse_data(data):
     return (int(c) for c in data.split(" "))
 
 
-def digits(x):
-    return len(str(x))
-
-
 def split(x):
-    s = str(x)
-    return int(s[: len(s) // 2]), int(s[len(s) // 2 :])
+    n = digits(x)
+    return divmod(x, POWERS_OF_TEN[n // 2])
 
 
-@cache
+# The same few thousand stone values come up over and over, so the cache rarely
+# fills, but it's bounded in case some input doesn't settle down like that
+@lru_cache(maxsize=1 << 16)
 def handle_stone(stone):
     if stone == 0:
         return (1,)
@@ -32,22 +34,190 @@ def handle_stone(stone):
         return (stone * 2024,)
 
 
-@cache
+@lru_cache(maxsize=1 << 20)
 def recursive_blink_x_times(x, data):
     if x == 0:
         return len(data)
     return sum(recursive_blink_x_times(x - 1, handle_stone(stone)) for stone in data)
 
 
-def part1():
-    data = parse_data(read_input())
+def part1_naive():
+    data = tuple(parse_data(read_input()))
     return recursive_blink_x_times(25, data)
 
 
-def part2():
-    data = parse_data(read_input())
+def part2_naive():
+    data = tuple(parse_data(read_input()))
     return recursive_blink_x_times(75, data)
 
 
+# Blinking with a count of each stone value instead of recursing on every stone.
+# Stones with the same value always turn into the same stones, so each value only
+# has to be handled once per blink, however many stones have it, and memory only
+# depends on how many distinct values there are.
+
+
+def blink(stones: Counter) -> Counter:
+    blinked = Counter()
+    for stone, count in stones.items():
+        for new_stone in handle_stone(stone):
+            blinked[new_stone] += count
+    return blinked
+
+
+def evolve(stones: Iterable[int], blinks: int) -> Iterator[Counter]:
+    """The count of each stone value after each of blinks blinks"""
+    counts = Counter(stones)
+    for _ in range(blinks):
+        counts = blink(counts)
+        yield counts
+
+
+def count_stones(stones: Iterable[int], blinks: int, report: bool = False) -> int:
+    """The number of stones after blinks blinks, printing how many different
+    values there are after each blink to stderr if report is set"""
+    counts = Counter(stones)
+    for blinked, counts in enumerate(evolve(counts, blinks), 1):
+        if report:
+            print(f"blink {blinked}: {len(counts)} distinct stones", file=sys.stderr)
+    return counts.total()
+
+
+def part1():
+    return count_stones(parse_data(read_input()), 25)
+
+
+def part2():
+    return count_stones(parse_data(read_input()), 75)
+
+
+def part1_report():
+    return count_stones(parse_data(read_input()), 25, report=True)
+
+
+def part2_report():
+    return count_stones(parse_data(read_input()), 75, report=True)
+
+
+# Fast-forwarding through many blinks at once. Starting from the input, only a fixed
+# set of stone values ever turns up, and a blink maps the counts of those values
+# linearly to new counts: it's a matrix, with a row per value saying how many of
+# each value that stone turns into. N blinks is then that matrix to the Nth power,
+# which takes about 2 * log2(N) matrix multiplications by repeated squaring.
+#
+# The counts grow exponentially, so for a huge N they're only practical modulo
+# something. Exact powers are fine while there are few distinct values, but real
+# inputs reach a few thousand, where the NumPy version (always modular) is the one
+# to use.
+
+
+def stone_closure(stones: Iterable[int], limit: int = 100_000) -> list[int]:
+    """Every stone value that can turn up from stones, in the order they're found"""
+    values = list(dict.fromkeys(stones))
+    seen = set(values)
+    # values grows as it's walked through, so this visits everything reachable
+    for stone in values:
+        for new_stone in handle_stone(stone):
+            if new_stone not in seen:
+                seen.add(new_stone)
+                values.append(new_stone)
+        if len(values) > limit:
+            raise ValueError(f"more than {limit} different stone values turn up")
+    return values
+
+
+def transition_matrix(values: list[int], index: dict[int, int]) -> list[dict[int, int]]:
+    """A blink as a sparse matrix: row i is {j: how many values[j] values[i] becomes}"""
+    matrix = []
+    for stone in values:
+        row = {}
+        for new_stone in handle_stone(stone):
+            j = index[new_stone]
+            row[j] = row.get(j, 0) + 1
+        matrix.append(row)
+    return matrix
+
+
+def multiply(
+    a: list[dict[int, int]], b: list[dict[int, int]], modulus: int | None = None
+) -> list[dict[int, int]]:
+    """The product of two sparse matrices, optionally modulo modulus"""
+    product = []
+    for row in a:
+        out = {}
+        for k, x in row.items():
+            for j, y in b[k].items():
+                out[j] = out.get(j, 0) + x * y
+        if modulus is not None:
+            out = {j: v % modulus for j, v in out.items()}
+        product.append(out)
+    return product
+
+
+def fast_forward(stones: Iterable[int], blinks: int, modulus: int | None = None) -> int:
+    """The number of stones after blinks blinks (modulo modulus, if given)"""
+    counts = Counter(stones)
+    values = stone_closure(counts)
+    index = {stone: i for i, stone in enumerate(values)}
+    power = transition_matrix(values, index)
+    # The counts are a matrix with a single row
+    vector = [{index[stone]: count for stone, count in counts.items()}]
+    while blinks:
+        if blinks & 1:
+            vector = multiply(vector, power, modulus)
+        blinks >>= 1
+        if blinks:
+            power = multiply(power, power, modulus)
+    total = sum(vector[0].values())
+    return total if modulus is None else total % modulus
+
+
+# The NumPy version does the same with dense matrices and BLAS. Float64 matrix
+# products are only exact below 2**53, so entries (below a modulus of at most 2**32)
+# are split into 16-bit halves and multiplied as three products of halves
+# (Karatsuba), whose sums stay exact for up to 2**19 different values.
+
+LIMB = 1 << 16
+MAX_MODULUS = 1 << 32
+MAX_VALUES = 1 << 19
+
+
+def multiply_mod(a: "np.ndarray", b: "np.ndarray", modulus: int) -> "np.ndarray":
+    """a @ b % modulus, exactly, for int64 arrays of values below modulus"""
+    a_high, a_low = (x.astype(np.float64) for x in np.divmod(a, LIMB))
+    b_high, b_low = (x.astype(np.float64) for x in np.divmod(b, LIMB))
+    high = a_high @ b_high
+    low = a_low @ b_low
+    middle = (a_high + a_low) @ (b_high + b_low) - high - low
+    high, middle, low = (x.astype(np.int64) for x in (high, middle, low))
+    # high * LIMB**2 + middle * LIMB + low, reducing as it goes to stay in int64
+    result = ((high % modulus) * LIMB + middle) % modulus
+    return (result * LIMB + low) % modulus
+
+
+def fast_forward_numpy(stones: Iterable[int], blinks: int, modulus: int) -> int:
+    """The number of stones after blinks blinks, modulo modulus (at most 2**32)"""
+    require_numpy("fast_forward_numpy")
+    if not 1 < modulus <= MAX_MODULUS:
+        raise ValueError(f"modulus must be between 2 and {MAX_MODULUS}")
+    counts = Counter(stones)
+    values = stone_closure(counts, MAX_VALUES)
+    index = {stone: i for i, stone in enumerate(values)}
+    power = np.zeros((len(values), len(values)), dtype=np.int64)
+    for i, row in enumerate(transition_matrix(values, index)):
+        for j, count in row.items():
+            power[i, j] = count % modulus
+    vector = np.zeros((1, len(values)), dtype=np.int64)
+    for stone, count in counts.items():
+        vector[0, index[stone]] = count % modulus
+    while blinks:
+        if blinks & 1:
+            vector = multiply_mod(vector, power, modulus)
+        blinks >>= 1
+        if blinks:
+            power = multiply_mod(power, power, modulus)
+    return int(vector.sum()) % modulus
+
+
 if __name__ == "__main__":
     print(part2())
@@ -3,6 +3,8 @@ import sys
 from itertools import product
 from typing import NamedTuple
 
+from inputcache import cached_parse
+
 
 def read_input():
     if len(sys.argv) == 2:
@@ -35,6 +37,7 @@ class Machine(NamedTuple):
         return Machine(self.a, self.b, self.prize + Vector(offset, offset))
 
 
+@cached_parse
 def parse_data(data) -> list[Machine]:
     machines = []
     lines = data.split("\n\n")
@@ -3,6 +3,8 @@ import sys
 from math import prod
 from typing import NamedTuple
 
+from inputcache import cached_parse
+
 
 def read_input():
     if len(sys.argv) == 2:
@@ -30,6 +32,7 @@ class Robot(NamedTuple):
     direction: Vector
 
 
+@cached_parse
 def parse_data(input) -> list[Robot]:
     robots = []
     for line in input.splitlines():
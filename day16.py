@@ -2,42 +2,37 @@ from collections import Counter, defaultdict
 import heapq
 import sys
 
+from grid import Grid
+from inputcache import cached_parse
+
 
 def read_input() -> str:
     with open(sys.argv[1]) as f:
         return f.read().strip()
 
 
+@cached_parse
 def parse_input(data):
-    race = set()
-    start = None
-    end = None
-    for y, line in enumerate(data.splitlines()):
-        for x, char in enumerate(line):
-            match char:
-                case ".":
-                    race.add((x, y))
-                case "S":
-                    start = (x, y)
-                case "E":
-                    end = (x, y)
-    assert start is not None
-    assert end is not None
+    race = Grid.from_text(data)
+    start = race.find("S")
+    end = race.find("E")
+    assert start != -1
+    assert end != -1
     return race, start, end
 
 
 def debug_print(race, start, end, path):
     pathset = set(path)
-    maxx, maxy = max(k[0] for k in race), max(k[1] for k in race)
-    for y in range(maxy + 1):
-        for x in range(maxx + 1):
-            if (x, y) == start:
+    for y in range(race.rows):
+        for x in range(race.cols):
+            i = race.index(y, x)
+            if i == start:
                 print("S", end="")
-            elif (x, y) == end:
+            elif i == end:
                 print("E", end="")
-            elif (x, y) in pathset:
+            elif i in pathset:
                 print("\033[91mo\033[0m", end="")
-            elif (x, y) in race:
+            elif race[i] == ".":
                 print(".", end="")
             else:
                 print("#", end="")
@@ -45,9 +40,14 @@ def debug_print(race, start, end, path):
     print()
 
 
+OPEN = ord(".")
+
+
 def find_paths(race, start, end):
+    cells = race.cells
+    up, right, down, left = race.offsets
     # (cost, prev_position, current_position, path)
-    pq = [(0, (start[0] - 1, start[1]), start, [])]
+    pq = [(0, start + left, start, [])]
     counter = Counter()  # count how many times we've visited a space
     min_cost = float("inf")  # minimum cost to reach the end
     min_cost_paths = defaultdict(set)  # spaces on paths that reach the end
@@ -65,14 +65,14 @@ def find_paths(race, start, end):
             print(cost)
             continue
 
-        for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-            prev_dir = (current[0] - previous[0], current[1] - previous[1])
-            if (dx, dy) == (-prev_dir[0], -prev_dir[1]):
+        prev_dir = current - previous
+        for d in (down, up, right, left):
+            if d == -prev_dir:
                 continue
-            next_pos = (current[0] + dx, current[1] + dy)
-            if next_pos in race | {end}:
+            next_pos = current + d
+            if cells[next_pos] == OPEN or next_pos == end:
                 new_path = path + [next_pos]
-                is_turn = (dx, dy) != prev_dir
+                is_turn = d != prev_dir
                 new_cost = cost + 1 + is_turn * 1000
                 heapq.heappush(pq, (new_cost, current, next_pos, new_path))
 
@@ -2,6 +2,8 @@ import sys
 from enum import Enum
 from typing import NamedTuple
 
+from inputcache import cached_parse
+
 
 def read_input():
     with open(sys.argv[1]) as f:
@@ -126,6 +128,7 @@ def dump(stdout):
     return ",".join(map(str, stdout))
 
 
+@cached_parse
 def parse_data(data):
     lines = data.splitlines()
 
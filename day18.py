@@ -1,6 +1,8 @@
 import sys
 import heapq
-from itertools import product
+
+from grid import Grid
+from inputcache import cached_parse
 
 
 def read_input():
@@ -8,6 +10,7 @@ def read_input():
         return f.read().strip()
 
 
+@cached_parse
 def parse_input(data):
     positions = []
     for row in data.splitlines():
@@ -19,13 +22,14 @@ def parse_input(data):
 def debug_print(memory_space, start, end, path, max_dim):
     for y in range(max_dim + 1):
         for x in range(max_dim + 1):
-            if (x, y) == start:
+            i = memory_space.index(y, x)
+            if i == start:
                 print("S", end="")
-            elif (x, y) == end:
+            elif i == end:
                 print("E", end="")
-            elif (x, y) in path:
+            elif i in path:
                 print("\033[91mo\033[0m", end="")
-            elif (x, y) in memory_space:
+            elif memory_space[i] == ".":
                 print(".", end="")
             else:
                 print("#", end="")
@@ -33,7 +37,11 @@ def debug_print(memory_space, start, end, path, max_dim):
     print()
 
 
+OPEN = ord(".")
+
+
 def find_paths(race, start, end):
+    cells = race.cells
     # (cost, current_position, path)
     pq = [(0, start, [])]
     visited = set()
@@ -48,17 +56,19 @@ def find_paths(race, start, end):
         if current == end:
             return cost
 
-        for dx, dy in ((0, 1), (0, -1), (1, 0), (-1, 0)):
-            next_pos = (current[0] + dx, current[1] + dy)
-            if next_pos in race | {end} and next_pos not in visited:
+        for d in race.offsets:
+            next_pos = current + d
+            if (cells[next_pos] == OPEN or next_pos == end) and next_pos not in visited:
                 new_path = path + [next_pos]
                 new_cost = cost + 1
                 heapq.heappush(pq, (new_cost, next_pos, new_path))
 
 
 def populate_grid(max_dimension, positions):
-    space = set((x, y) for x, y in product(range(max_dimension+1), repeat=2))
-    return space - positions
+    space = Grid(max_dimension + 1, max_dimension + 1)
+    for x, y in positions:
+        space[space.index(y, x)] = "#"
+    return space
 
 
 def part1():
@@ -66,8 +76,9 @@ def part1():
     bytes_to_process = 1024  # Spent way too long remembering that I don't include every single byte 😅
     positions = parse_input(read_input())
     memory_space = populate_grid(max_dim, set(positions[:bytes_to_process]))
-    min_cost = find_paths(memory_space, (0, 0), (max_dim, max_dim))
-    debug_print(memory_space, (0, 0), (max_dim, max_dim), set(), max_dim)
+    start, end = memory_space.index(0, 0), memory_space.index(max_dim, max_dim)
+    min_cost = find_paths(memory_space, start, end)
+    debug_print(memory_space, start, end, set(), max_dim)
     return min_cost
 
 
@@ -86,7 +97,8 @@ def bs(arr, condition, start_idx=0):
 
 def is_possible(positions, max_dim):
     memory_space = populate_grid(max_dim, set(positions))
-    min_cost = find_paths(memory_space, (0, 0), (max_dim, max_dim))
+    start, end = memory_space.index(0, 0), memory_space.index(max_dim, max_dim)
+    min_cost = find_paths(memory_space, start, end)
     return min_cost is not None
 
 
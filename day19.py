@@ -1,11 +1,14 @@
 import sys
 
+from inputcache import cached_parse
+
 
 def read_input():
     with open(sys.argv[1]) as f:
         return f.read().strip()
 
 
+@cached_parse
 def parse_input(data):
     patternstr, designstr = data.split("\n\n")
     patterns = patternstr.split(", ")
@@ -1,5 +1,12 @@
 import sys
-from typing import Generator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Callable, Generator, Iterable
+
+from numeric import np, require_numpy
+from parallel import imap_bounded, worker_count
+from stream import iter_lines, line_ranges
 
 def parse_input() -> Generator[str, None,  None]:
     # Stream one line at a time from stdin
@@ -10,35 +17,146 @@ def parse_report(line: str) -> list[int]:
     # Parse the level from the input
     return [int(x) for x in line.split()]
 
-def rule1(report: list[int]) -> bool:
-    # Check that the values are monotonically increasing OR decreasing
-    return report == sorted(report) or report == sorted(report, reverse=True)
+def gradual(a: int, b: int, direction: int) -> bool:
+    # A step is fine if it goes in direction (1 up, -1 down) by 1 to 3 inclusive
+    return 1 <= (b - a) * direction <= 3
+
+def first_bad_step(report: list[int], direction: int) -> int:
+    # The index i of the first step report[i] -> report[i + 1] that isn't gradual, or -1
+    for i in range(len(report) - 1):
+        if not gradual(report[i], report[i + 1], direction):
+            return i
+    return -1
 
-def rule2(report: list[int]) -> bool:
-    # Check that the difference between adjacent values is between 1 and 3 inclusive
-    return all(0 < abs(a - b) <= 3 for a, b in zip(report, report[1:]))
+def is_gradual(report: list[int], direction: int, skip: int = -1) -> bool:
+    # Check every step in one pass, pretending the level at index skip isn't there
+    previous = None
+    for i, level in enumerate(report):
+        if i == skip:
+            continue
+        if previous is not None and not gradual(previous, level, direction):
+            return False
+        previous = level
+    return True
 
 def is_safe(report: list[int]) -> bool:
-    return rule1(report) and rule2(report)
+    # The values are monotonically increasing OR decreasing,
+    # and adjacent values differ by between 1 and 3 inclusive
+    return is_gradual(report, 1) or is_gradual(report, -1)
 
 def part1() -> int:
     # count the safe levels
     return sum(is_safe(parse_report(line)) for line in parse_input())
 
-def generate_reports(report: list[int]) -> Generator[list[int], None, None]:
-    yield report
-    for i in range(len(report)):
-        yield report[:i] + report[i+1:]
-
 def is_safe2(report: list[int]) -> bool:
     # Same rules as before, but we can tolerate a single bad value.
-    # Let's test that by simply removing a value until we have a safe report.
-    return any(is_safe(r) for r in generate_reports(report))
+    # If removing one level makes the report safe, that level has to be one side of
+    # the first bad step (otherwise that step would still be there),
+    # so there are only two candidates to try per direction.
+    for direction in (1, -1):
+        i = first_bad_step(report, direction)
+        if i == -1:
+            return True
+        if any(is_gradual(report, direction, skip) for skip in (i, i + 1)):
+            return True
+    return False
 
 def part2() -> int:
     # count the safe levels
     return sum(is_safe2(parse_report(line)) for line in parse_input())
 
+# Batched NumPy mode: reports are packed into a zero-padded matrix, one row per report,
+# and the checks above are done for every report at once with array operations.
+
+def report_matrix(reports: list[list[int]]) -> tuple["np.ndarray", "np.ndarray"]:
+    lengths = np.array([len(r) for r in reports], dtype=np.int64)
+    levels = np.zeros((len(reports), max(lengths.max(initial=0), 1)), dtype=np.int64)
+    for row, report in zip(levels, reports):
+        row[: len(report)] = report
+    return levels, lengths
+
+def gradual_steps(steps: "np.ndarray", direction: int) -> "np.ndarray":
+    steps = steps * direction
+    return (steps >= 1) & (steps <= 3)
+
+def safe_batch(levels: "np.ndarray", lengths: "np.ndarray", dampener: bool = False):
+    # Which reports (rows) are safe, with or without the problem dampener
+    n, width = levels.shape
+    columns = np.arange(width)
+    # Step j goes from level j to level j + 1; steps past the end of a report are padding
+    real_step = columns[:-1] < (lengths - 1)[:, None]
+    # Removing level k joins levels k - 1 and k + 1 with a new step, if both exist
+    bridges = levels[:, 2:] - levels[:, :-2]
+    real_bridge = columns[2:] < lengths[:, None]
+    safe = np.zeros(n, dtype=bool)
+    for direction in (1, -1):
+        bad = ~gradual_steps(levels[:, 1:] - levels[:, :-1], direction) & real_step
+        bad_count = bad.sum(axis=1)
+        safe |= bad_count == 0
+        if not dampener:
+            continue
+        # Removing level k drops steps k - 1 and k, so count the bad steps that remain
+        padded = np.pad(bad, ((0, 0), (1, 1)))
+        remaining = bad_count[:, None] - padded[:, :-1] - padded[:, 1:]
+        bridge_ok = np.ones((n, width), dtype=bool)
+        bridge_ok[:, 1:-1] = gradual_steps(bridges, direction) | ~real_bridge
+        removable = columns < lengths[:, None]
+        safe |= ((remaining == 0) & bridge_ok & removable).any(axis=1)
+    return safe
+
+def batches(lines: Iterable[str], size: int) -> Generator[list[list[int]], None, None]:
+    lines = iter(lines)
+    while batch := [parse_report(line) for line in islice(lines, size)]:
+        yield batch
+
+def count_safe_batched(lines: Iterable[str], dampener: bool, batch_size: int = 100_000) -> int:
+    require_numpy("the batched mode of day 2")
+    return sum(
+        int(safe_batch(*report_matrix(batch), dampener).sum())
+        for batch in batches(lines, batch_size)
+    )
+
+def part1_batched() -> int:
+    return count_safe_batched(parse_input(), dampener=False)
+
+def part2_batched() -> int:
+    return count_safe_batched(parse_input(), dampener=True)
+
+# Parallel mode: reports are independent, so the input is split into byte ranges on
+# line boundaries and each worker process counts the safe reports in its ranges.
+# Reading stdin, which can't be split up front, batches of lines are handed out instead.
+
+Check = Callable[[list[int]], bool]
+
+def count_safe(check: Check, lines: Iterable[str]) -> int:
+    return sum(check(parse_report(line)) for line in lines)
+
+def count_safe_in_range(check: Check, path: str, byte_range: tuple[int, int]) -> int:
+    start, end = byte_range
+    return count_safe(check, iter_lines(path, start=start, end=end))
+
+def count_safe_parallel(
+    check: Check, path: str | None = None, workers: int | None = None, batch_size: int = 10_000
+) -> int:
+    workers = worker_count(workers)
+    with ProcessPoolExecutor(workers) as executor:
+        if path is not None:
+            # A few ranges per worker, so one slow range doesn't hold everything up
+            ranges = line_ranges(path, workers * 4)
+            return sum(executor.map(partial(count_safe_in_range, check, path), ranges))
+        lines = iter_lines()  # Skips blank lines, like the file ranges do
+        batches = iter(lambda: list(islice(lines, batch_size)), [])
+        counts = imap_bounded(executor, partial(count_safe, check), batches, workers * 2)
+        return sum(counts)
+
+def part1_parallel(workers: int | None = None) -> int:
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    return count_safe_parallel(is_safe, path, workers)
+
+def part2_parallel(workers: int | None = None) -> int:
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    return count_safe_parallel(is_safe2, path, workers)
+
 
 if __name__ == "__main__":
     print(part2())
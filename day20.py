@@ -1,7 +1,10 @@
-from collections import defaultdict, Counter
+from collections import Counter, deque
 from itertools import product
 import sys
 
+from grid import Grid
+from inputcache import cached_parse
+
 
 def read_input():
     with open(sys.argv[1]) as f:
@@ -9,77 +12,78 @@ def read_input():
 
 
 def debug_print(track, start, end, shortcuts):
-    maxx, maxy = max(x for x, y in track), max(y for x, y in track)
-    for y in range(maxy + 2):
-        for x in range(maxx + 2):
-            if (x, y) == start:
+    for y in range(track.rows):
+        for x in range(track.cols):
+            i = track.index(y, x)
+            if i == start:
                 print("S", end="")
-            elif (x, y) == end:
+            elif i == end:
                 print("E", end="")
-            elif (x, y) in shortcuts:
+            elif i in shortcuts:
                 print("\033[91m#\033[0m", end="")
-            elif (x, y) in track:
+            elif track[i] == ".":
                 print(".", end="")
             else:
                 print("#", end="")
         print()
 
 
+# No cheat is longer than this. The track is padded by this much so a cheat
+# can be an index offset that never wraps around onto the next row.
+MAX_CHEAT_LENGTH = 20
+OPEN = ord(".")
+
+
+@cached_parse
 def parse_input(input):
-    start, end = None, None
-    data = set()
-    for y, row in enumerate(input.splitlines()):
-        for x, cell in enumerate(row):
-            if cell == ".":
-                data.add((x, y))
-            elif cell == "S":
-                start = (x, y)
-            elif cell == "E":
-                end = (x, y)
-    return data, start, end
+    track = Grid.from_text(input, pad=MAX_CHEAT_LENGTH)
+    return track, track.find("S"), track.find("E")
 
 
 def score_cells(racetrack, start, end):
-    """Return the score of each cell in the racetrack."""
-    score = {start: 0}
-    queue = [start]
+    """Return the score of each cell in the racetrack (-1 off the track)."""
+    cells = racetrack.cells
+    score = [-1] * len(cells)
+    score[start] = 0
+    queue = deque([start])
     while queue:
-        x, y = queue.pop(0)
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-            new_loc = x + dx, y + dy
-            if (new_loc in racetrack or new_loc == end) and new_loc not in score:
-                score[new_loc] = score[(x, y)] + 1
+        i = queue.popleft()
+        for d in racetrack.offsets:
+            new_loc = i + d
+            if (cells[new_loc] == OPEN or new_loc == end) and score[new_loc] < 0:
+                score[new_loc] = score[i] + 1
                 queue.append(new_loc)
     return score
 
 
-def taxicab_distance(p1, p2):
-    return abs(p1[0] - p2[0]) + abs(p1[1] - p2[1])
-
-
-def spaces_within_x_of_point(point, x):
-    for dx, dy in product(range(-x, x + 1), repeat=2):
-        if taxicab_distance(point, (point[0] + dx, point[1] + dy)) <= x:
-            yield (point[0] + dx, point[1] + dy)
+def offsets_within(track, x):
+    """Index offsets of every space within x of a point, with their distance."""
+    offsets = []
+    for dy, dx in product(range(-x, x + 1), repeat=2):
+        distance = abs(dx) + abs(dy)
+        if 0 < distance <= x:
+            offsets.append((track.offset(dy, dx), distance))
+    return offsets
 
 
-def find_shortcuts(scores, max_cheat_length):
+def find_shortcuts(track, scores, max_cheat_length):
     """
-    Return all racetrack spaces accessible within 20 units of each space.
-    These shortcuts will be (start, finish) pairs mapped to the # of picoseconds saved.
+    Count the shortcuts between racetrack spaces within max_cheat_length of each other,
+    by the number of picoseconds they save.
     Keep in mind that the time saved is the difference in original score MINUS the time it takes to accompolish the shortcut.
     """
-    shortcuts = defaultdict(lambda: float("inf"))
-    for start in sorted(scores, key=lambda p: scores[p]):
-        for end in spaces_within_x_of_point(start, max_cheat_length):
-            if end in scores:
-                diff = scores[end] - scores[start] - taxicab_distance(start, end)
-                if diff > 0:
-                    shortcuts[(start, end)] = min(shortcuts[(start, end)], diff)
-                # debug_print(set(scores), start, end, {})
-                # print("DIFF:", diff)
-                # input()
-    return shortcuts
+    if max_cheat_length > track.pad:
+        raise ValueError(f"cheats can be at most {track.pad} long")
+    offsets = offsets_within(track, max_cheat_length)
+    savings = Counter()
+    for start, start_score in enumerate(scores):
+        if start_score < 0:
+            continue
+        for offset, distance in offsets:
+            diff = scores[start + offset] - start_score - distance
+            if diff > 0:
+                savings[diff] += 1
+    return savings
 
 
 # 2440094 too high
@@ -89,8 +93,7 @@ def find_shortcuts(scores, max_cheat_length):
 def run_it(cheat_length, minimum_gains):
     data, start, end = parse_input(read_input())
     scores = score_cells(data, start, end)
-    shortcuts = find_shortcuts(scores, cheat_length)
-    count_per_saves = Counter(shortcuts.values())
+    count_per_saves = find_shortcuts(data, scores, cheat_length)
     return sum(
         cheats for saves, cheats in count_per_saves.items() if saves >= minimum_gains
     )
@@ -2,12 +2,16 @@ import sys
 from enum import Enum
 from functools import cache
 
+from inputcache import cached_parse
+from stream import input_lines
+
 
 def read_input():
     with open(sys.argv[1]) as f:
         return f.read().strip()
 
 
+@cached_parse
 def parse_input(data):
     return data.splitlines()
 
@@ -138,5 +142,14 @@ def part2():
     return sum(int(code[:-1]) * get_sequence_length(code, 25) for code in codes)
 
 
+# Streaming variant: each code is scored on its own as it's read.
+
+
+def part2_streaming():
+    return sum(
+        int(code[:-1]) * get_sequence_length(code, 25) for code in input_lines()
+    )
+
+
 if __name__ == "__main__":
     print(part2())
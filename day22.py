@@ -2,12 +2,16 @@ import sys
 from collections import defaultdict
 from functools import cache
 
+from inputcache import cached_parse
+from stream import input_lines
+
 
 def read_input():
     with open(sys.argv[1]) as f:
         return f.read().strip()
 
 
+@cached_parse
 def parse_input(data):
     return [int(x) for x in data.splitlines()]
 
@@ -98,5 +102,36 @@ def part2():
     return profit(best_diff)
 
 
+# Streaming variants. Part 1 only needs one secret at a time. For part 2, each
+# buyer's first price for every sequence of changes is folded into a running
+# total as soon as it's known, so memory is bounded by the number of possible
+# sequences (19 ** 4) rather than the number of buyers.
+
+
+def part1_streaming():
+    return sum(get_nth(int(line), 2000) for line in input_lines())
+
+
+def buyer_profits(start_value, n=2000):
+    """Map each sequence of 4 price changes to the price at its first occurrence."""
+    profits = {}
+    prices = [calculate_price(start_value)]
+    prices.extend(calculate_price(secret) for secret in generate_n(start_value, n))
+    diffs = [b - a for a, b in zip(prices, prices[1:])]
+    for i in range(3, len(diffs)):
+        ds = (diffs[i - 3], diffs[i - 2], diffs[i - 1], diffs[i])
+        if ds not in profits:
+            profits[ds] = prices[i + 1]
+    return profits
+
+
+def part2_streaming():
+    totals = defaultdict(int)
+    for line in input_lines():
+        for ds, price in buyer_profits(int(line)).items():
+            totals[ds] += price
+    return max(totals.values())
+
+
 if __name__ == "__main__":
     print(part2())
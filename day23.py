@@ -1,12 +1,15 @@
 import sys
 from collections import defaultdict
 
+from inputcache import cached_parse
+
 
 def read_input():
     with open(sys.argv[1]) as f:
         return f.read().strip()
 
 
+@cached_parse
 def parse_input(data):
     """Return an edge map from the list of edges."""
     edges = defaultdict(set)
@@ -1,5 +1,13 @@
+import contextlib
+import mmap
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import NamedTuple
+
+from parallel import worker_count
 
 
 def read_input() -> str:
@@ -9,22 +17,139 @@ def read_input() -> str:
     return sys.stdin.read()
 
 
+@contextlib.contextmanager
+def mapped_input():
+    """
+    Memory-map the input (from the command line or a file redirected to stdin),
+    so it can be scanned without reading it all into memory.
+    Falls back to reading stdin when it's a pipe.
+    """
+    with contextlib.ExitStack() as stack:
+        if len(sys.argv) == 2:
+            f = stack.enter_context(open(sys.argv[1], 'rb'))
+        else:
+            f = sys.stdin.buffer
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            buffer = stack.enter_context(mapped)
+        except (OSError, ValueError):
+            # Not mappable: a pipe, or an empty file
+            buffer = f.read()
+        yield buffer
+
+
+# One pattern for every instruction, so a single pass over the input sees them in order
+INSTRUCTION = re.compile(rb"mul\((\d+),(\d+)\)|(do\(\))|(don't\(\))")
+
+
+def scan(
+    buffer, enabled: bool = True, pos: int = 0, endpos: int | None = None
+) -> tuple[int, int, bool]:
+    """
+    Scan buffer[pos:endpos] once, returning the sum of all mul instructions,
+    the sum of just the enabled ones, and whether mul is enabled at the end.
+    """
+    total = enabled_total = 0
+    if endpos is None:
+        endpos = len(buffer)
+    for match in INSTRUCTION.finditer(buffer, pos, endpos):
+        a, b, do, dont = match.groups()
+        if do:
+            enabled = True
+        elif dont:
+            enabled = False
+        else:
+            product = int(a) * int(b)
+            total += product
+            if enabled:
+                enabled_total += product
+    return total, enabled_total, enabled
+
+
 def part1() -> int:
-    data = read_input()
-    value_pairs = re.findall(r'mul\((\d+),(\d+)\)', data)
-    return sum(int(a) * int(b) for a, b in value_pairs)
+    with mapped_input() as buffer:
+        total, _, _ = scan(buffer)
+    return total
 
 def part2() -> int:
-    data = read_input()
-    total = 0
-    do_data = data.split('do()')
-    for do in do_data:
-        dont_data = do.split("don't()")
-        use_this_data = dont_data[0]
-        value_pairs = re.findall(r'mul\((\d+),(\d+)\)', use_this_data)
-        total += sum(int(a) * int(b) for a, b in value_pairs)
+    with mapped_input() as buffer:
+        _, total, _ = scan(buffer)
     return total
 
 
+# Parallel scan. Whether mul is enabled depends on everything before it, so each chunk
+# of the input is scanned for both possible starting states at once, and the chunks are
+# then stitched together in order, carrying the state from one chunk into the next.
+
+# A chunk owns every instruction that starts inside it, and reads up to this far past
+# its end to finish one that starts inside but runs over the boundary.
+# (No real instruction comes anywhere near this long.)
+OVERLAP = 1 << 16
+
+
+class Chunk(NamedTuple):
+    # The sum of every mul in the chunk
+    total: int
+    # The sum of the enabled muls, if the chunk starts (disabled, enabled)
+    enabled_total: tuple[int, int]
+    # Whether mul is enabled at the end of the chunk, if it starts (disabled, enabled)
+    enabled_after: tuple[bool, bool]
+
+
+def scan_chunk(path: str, byte_range: tuple[int, int]) -> Chunk:
+    start, end = byte_range
+    total = 0
+    # Index 0 follows the chunk starting disabled, index 1 enabled
+    enabled_total = [0, 0]
+    enabled = [False, True]
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with buffer:
+        for match in INSTRUCTION.finditer(buffer, start, min(end + OVERLAP, len(buffer))):
+            if match.start() >= end:
+                break
+            a, b, do, dont = match.groups()
+            if do:
+                enabled = [True, True]
+            elif dont:
+                enabled = [False, False]
+            else:
+                product = int(a) * int(b)
+                total += product
+                for state in (0, 1):
+                    if enabled[state]:
+                        enabled_total[state] += product
+    return Chunk(total, tuple(enabled_total), tuple(enabled))
+
+
+def scan_parallel(path: str, workers: int | None = None) -> tuple[int, int]:
+    """Scan the file at path across a process pool, returning the part 1 and 2 totals"""
+    workers = worker_count(workers)
+    size = os.path.getsize(path)
+    parts = workers * 4
+    bounds = [size * i // parts for i in range(parts + 1)]
+    ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+    total = enabled_total = 0
+    enabled = True
+    with ProcessPoolExecutor(workers) as executor:
+        for chunk in executor.map(partial(scan_chunk, path), ranges):
+            total += chunk.total
+            enabled_total += chunk.enabled_total[enabled]
+            enabled = chunk.enabled_after[enabled]
+    return total, enabled_total
+
+
+def part1_parallel(workers: int | None = None) -> int:
+    if len(sys.argv) != 2:
+        # stdin can't be split up front
+        return part1()
+    return scan_parallel(sys.argv[1], workers)[0]
+
+def part2_parallel(workers: int | None = None) -> int:
+    if len(sys.argv) != 2:
+        return part2()
+    return scan_parallel(sys.argv[1], workers)[1]
+
+
 if __name__ == '__main__':
     print(part2())
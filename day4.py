@@ -1,6 +1,7 @@
-import re
 import sys
 
+from numeric import np  # Without NumPy the bitmask search is used
+
 
 def read_input():
     if len(sys.argv) == 2:
@@ -9,101 +10,164 @@ def read_input():
     return sys.stdin.read().strip()
 
 
-def rotate_90_degrees(data: list[str]) -> list[str]:
-    new_data = []
-    for i in range(len(data[0])):
-        new_row = ""
-        for j in range(len(data)):
-            new_row += data[len(data) - 1 - j][i]
-        new_data.append(new_row)
-    return new_data
-
-
-def rotate_45_degrees(data: list[str]) -> list[str]:
-    # rotate the matrix 45 degrees, e.g.
-    #              C
-    # > A B C      B F
-    # > D E F  ->  A E I
-    # > G H I      D H
-    #              G
-    new_data = []
-    max_index_sum = len(data) + len(data[0]) - 1
-
-    for s in range(max_index_sum):
-        new_row = ""
-        for i in range(max(len(data), len(data[0]))):
-            j = s - i
-            if 0 <= i < len(data) and 0 <= j < len(data[0]):
-                new_row += data[i][j]
-        if new_row:
-            new_data.append(new_row)
-
-    return new_data
+# The whole puzzle is searched in place, as one flat byte buffer. With rows joined by
+# newlines, moving one row down is a step of (row length + 1), and the newline at the
+# end of each row keeps horizontal and diagonal steps from wrapping onto the next row.
+#
+# For each letter, a bitmask marks every position in the buffer that holds it
+# (one byte per position, so bit 8 * i is set if position i holds the letter).
+# Shifting a letter's mask by k steps in a direction lines up "the letter k steps away"
+# with every starting position, so ANDing the shifted masks of a word's letters leaves
+# a bit set at every position where the word starts in that direction.
+
+DIRECTIONS = [
+    (dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (dr, dc) != (0, 0)
+]
+# One of each pair of opposite directions
+HALF_DIRECTIONS = DIRECTIONS[:4]
+
+# A 2D pattern of letters, as (row, column) offsets from an anchor cell
+Stencil = dict[tuple[int, int], str]
+
+
+class WordSearch:
+    def __init__(self, data: str):
+        self.buffer = data.encode()
+        self.width = data.find("\n")
+        if self.width == -1:
+            self.width = len(data)
+        self.stride = self.width + 1
+        self.rows = (len(self.buffer) + 1) // self.stride
+        self.masks = {}
+        self.column_masks = {}
+
+    def offset(self, dr: int, dc: int) -> int:
+        return dr * self.stride + dc
+
+    def mask(self, letter: str) -> int:
+        """Bitmask of the positions holding letter"""
+        if letter not in self.masks:
+            table = bytearray(256)
+            table[ord(letter)] = 1
+            self.masks[letter] = int.from_bytes(self.buffer.translate(table), "little")
+        return self.masks[letter]
+
+    def column_mask(self, dc: int) -> int:
+        """Bitmask of the positions that are still inside the grid dc columns over"""
+        if dc not in self.column_masks:
+            row = bytes(0 <= c + dc < self.width for c in range(self.stride))
+            self.column_masks[dc] = int.from_bytes(row * self.rows, "little")
+        return self.column_masks[dc]
+
+    def shifted(self, letter: str, steps: int) -> int:
+        """Mask of letter, moved so the position `steps` away lines up with each position"""
+        mask = self.mask(letter)
+        return mask >> (8 * steps) if steps >= 0 else mask << (-8 * steps)
+
+    def match(self, stencil: Stencil) -> int:
+        """Bitmask of every anchor position where stencil matches"""
+        found = self.column_mask(0)  # Every cell, until the stencil narrows it down
+        for (dr, dc), letter in stencil.items():
+            found &= self.shifted(letter, self.offset(dr, dc))
+            if abs(dc) > 1:
+                # One column over lands on a row's newline, which matches no letter,
+                # but further than that could wrap around onto a letter in another row.
+                found &= self.column_mask(dc)
+            if not found:
+                break
+        return found
+
+    def match_any(self, stencils: list[Stencil]) -> int:
+        """Bitmask of every anchor position where at least one of stencils matches"""
+        found = self.match(stencils[0])
+        for stencil in stencils[1:]:
+            found |= self.match(stencil)
+        return found
+
+    @staticmethod
+    def total(found: int) -> int:
+        """The number of positions in a mask"""
+        return found.bit_count()
+
+    def count_stencil(self, stencil: Stencil) -> int:
+        return self.total(self.match(stencil))
+
+    def count(self, word: str) -> int:
+        """Count every occurrence of word, in all 8 directions"""
+        if not word:
+            raise ValueError("can't search for an empty word")
+        if len(word) == 1:
+            # Every direction finds the same cells
+            directions = DIRECTIONS[:1]
+        elif word == word[::-1]:
+            # Reading a palindrome backwards finds the same cells again
+            directions = HALF_DIRECTIONS
+        else:
+            directions = DIRECTIONS
+        return sum(
+            self.count_stencil(
+                {(k * dr, k * dc): letter for k, letter in enumerate(word)}
+            )
+            for dr, dc in directions
+        )
+
+
+class ArrayWordSearch(WordSearch):
+    """
+    The same search with NumPy: masks are boolean arrays the shape of the grid,
+    and a stencil cell is matched by slicing its letter's mask at that offset.
+    """
+
+    def __init__(self, data: str):
+        super().__init__(data)
+        cells = np.frombuffer(self.buffer + b"\n", dtype=np.uint8)
+        self.grid = cells.reshape(self.rows, self.stride)[:, : self.width]
+
+    def mask(self, letter: str) -> "np.ndarray":
+        if letter not in self.masks:
+            self.masks[letter] = self.grid == ord(letter)
+        return self.masks[letter]
+
+    def match(self, stencil: Stencil) -> "np.ndarray":
+        found = np.zeros(self.grid.shape, dtype=bool)
+        # Only anchors that keep every cell of the stencil inside the grid can match
+        top = max((-dr for dr, _ in stencil if dr < 0), default=0)
+        bottom = self.rows - max((dr for dr, _ in stencil if dr > 0), default=0)
+        left = max((-dc for _, dc in stencil if dc < 0), default=0)
+        right = self.width - max((dc for _, dc in stencil if dc > 0), default=0)
+        if top >= bottom or left >= right:
+            return found
+        window = found[top:bottom, left:right]
+        window[...] = True
+        for (dr, dc), letter in stencil.items():
+            window &= self.mask(letter)[top + dr : bottom + dr, left + dc : right + dc]
+        return found
+
+    @staticmethod
+    def total(found: "np.ndarray") -> int:
+        return int(np.count_nonzero(found))
+
+
+def word_search(data: str) -> WordSearch:
+    return ArrayWordSearch(data) if np is not None else WordSearch(data)
 
 
 def count_xmas(data: str) -> int:
-    ninety_deg = "\n".join(rotate_90_degrees(data.split("\n")))
-    forty_five = "\n".join(rotate_45_degrees(data.split("\n")))
-    forty_five_rev = "\n".join(rotate_45_degrees(ninety_deg.split("\n")))
-
-    match_expression = r"XMAS"
-
-    foreward = re.findall(match_expression, data)
-    backward = re.findall(match_expression, data[::-1])
-    up = re.findall(match_expression, ninety_deg)
-    down = re.findall(match_expression, ninety_deg[::-1])
-    diag = re.findall(match_expression, forty_five)
-    diag_rev = re.findall(match_expression, forty_five[::-1])
-    other_diag = re.findall(match_expression, forty_five_rev)
-    other_diag_rev = re.findall(match_expression, forty_five_rev[::-1])
-
-    return (
-        len(foreward)
-        + len(backward)
-        + len(up)
-        + len(down)
-        + len(diag)
-        + len(diag_rev)
-        + len(other_diag)
-        + len(other_diag_rev)
-    )
-
-
-def arr_get(data: list[str], i: int, j: int) -> str:
-    if 0 <= i < len(data) and 0 <= j < len(data[0]):
-        return data[i][j]
-    return None
+    return word_search(data).count("XMAS")
 
 
 def count_x_mas(data: str) -> int:
-    arr = data.split("\n")
-
-    total = 0
-    for i in range(len(arr)):
-        for j in range(len(arr[0])):
-            if arr[i][j] == "A":
-                if (
-                    (
-                        arr_get(arr, i - 1, j - 1) == "M"
-                        and arr_get(arr, i + 1, j + 1) == "S"
-                    )
-                    or (
-                        arr_get(arr, i - 1, j - 1) == "S"
-                        and arr_get(arr, i + 1, j + 1) == "M"
-                    )
-                ) and (
-                    (
-                        arr_get(arr, i - 1, j + 1) == "M"
-                        and arr_get(arr, i + 1, j - 1) == "S"
-                    )
-                    or (
-                        arr_get(arr, i - 1, j + 1) == "S"
-                        and arr_get(arr, i + 1, j - 1) == "M"
-                    )
-                ):
-                    total += 1
-
-    return total
+    """Count the MAS crosses, i.e. an A with M and S at opposite ends of both diagonals"""
+    search = word_search(data)
+    crosses = search.match({(0, 0): "A"})
+    for (dr, dc) in ((-1, -1), (-1, 1)):
+        crosses &= search.match_any(
+            [
+                {(dr, dc): "M", (-dr, -dc): "S"},
+                {(dr, dc): "S", (-dr, -dc): "M"},
+            ]
+        )
+    return search.total(crosses)
 
 
 def part1() -> int:
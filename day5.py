@@ -1,6 +1,11 @@
-from collections import namedtuple
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import sys
 
+from inputcache import cached_parse
+from parallel import imap_bounded, worker_count
+
 
 def read_input():
     if len(sys.argv) == 2:
@@ -9,29 +14,35 @@ def read_input():
     return sys.stdin.read().strip()
 
 
-Rule = namedtuple("Rule", ["before", "after"])
 Update = list[int]
+# Maps each page to the set of pages the rules say must come after it
+RuleIndex = dict[int, set[int]]
+
+NO_PAGES = frozenset()
 
 
-def parse_input(data: str) -> tuple[list[Rule], list[Update]]:
+@cached_parse
+def parse_input(data: str) -> tuple[RuleIndex, list[Update]]:
     rulestr, updatestr = data.split("\n\n")
-    rules = [
-        (int(before), int(after))
-        for before, after in (line.split("|") for line in rulestr.split("\n"))
-    ]
+    rules = {}
+    for line in rulestr.split("\n"):
+        before, after = line.split("|")
+        rules.setdefault(int(before), set()).add(int(after))
     updates = [[int(x) for x in line.split(",")] for line in updatestr.split("\n")]
 
     return rules, updates
 
 
-def satisfies_rule(update: Update, rule: Rule) -> bool:
-    before, after = rule
-    if not (before in update and after in update):
-        # Rules only apply if both pages are present
-        return True
-    bi = update.index(before)
-    ai = update.index(after)
-    return bi < ai
+def is_ordered(update: Update, rules: RuleIndex) -> bool:
+    """Check an update against every rule that applies to it in one pass"""
+    seen = set()
+    for page in update:
+        # Rules only apply if both pages are present, so a page is out of order
+        # exactly when one of the pages that belong after it has already been seen.
+        if not rules.get(page, NO_PAGES).isdisjoint(seen):
+            return False
+        seen.add(page)
+    return True
 
 
 def middle_value(update: Update) -> int:
@@ -41,38 +52,98 @@ def middle_value(update: Update) -> int:
 def part1() -> int:
     """Sum the middle value of each update that satisfies all the rules"""
     rules, updates = parse_input(read_input())
-    return sum(
-        middle_value(update)
-        for update in updates
-        if all(satisfies_rule(update, rule) for rule in rules)
-    )
-
-
-def correct_update(update: Update, rules: list[Rule]) -> Update:
-    """Correct an update to satisfy all the rules"""
-    while not all(satisfies_rule(update, rule) for rule in rules):
-        for rule in rules:
-            if not satisfies_rule(update, rule):
-                before, after = rule
-                bi = update.index(before)
-                ai = update.index(after)
-                if bi > ai:
-                    update[bi], update[ai] = update[ai], update[bi]
-    return update
+    return sum(middle_value(update) for update in updates if is_ordered(update, rules))
+
+
+def correct_update(update: Update, rules: RuleIndex) -> Update:
+    """
+    Correct an update to satisfy all the rules, by topologically sorting its pages
+    (Kahn's algorithm) using only the rules between pages in the update
+    """
+    pages = set(update)
+    if len(pages) != len(update):
+        # The rules can't order a page relative to itself
+        raise ValueError(f"update {update} has a duplicate page")
+    after = {page: rules.get(page, NO_PAGES) & pages for page in update}
+    # How many pages in the update must come before each page
+    waiting_on = dict.fromkeys(update, 0)
+    for page in update:
+        for later in after[page]:
+            waiting_on[later] += 1
+    # Pages that are free to go next, taken in their original order
+    ready = deque(page for page in update if not waiting_on[page])
+    corrected = []
+    while ready:
+        page = ready.popleft()
+        corrected.append(page)
+        for later in after[page]:
+            waiting_on[later] -= 1
+            if not waiting_on[later]:
+                ready.append(later)
+    if len(corrected) != len(pages):
+        raise ValueError(f"the rules for update {update} contain a cycle")
+    return corrected
 
 
 def part2() -> int:
     """Correct incorrect updates and add *their* middle values"""
     rules, updates = parse_input(read_input())
 
-    incorrect_updates = [
-        update
-        for update in updates
-        if not all(satisfies_rule(update, rule) for rule in rules)
-    ]
-    for update in incorrect_updates:
-        correct_update(update, rules)
-    return sum(middle_value(update) for update in incorrect_updates)
+    incorrect_updates = [update for update in updates if not is_ordered(update, rules)]
+    return sum(middle_value(correct_update(update, rules)) for update in incorrect_updates)
+
+
+# Parallel mode: once the rules are parsed every update can be checked on its own,
+# so batches of updates are spread over a process pool. The rule index is sent to
+# each worker once, when it starts, rather than with every batch.
+
+_worker_rules: RuleIndex = {}
+
+
+def _init_worker(rules: RuleIndex):
+    global _worker_rules
+    _worker_rules = rules
+
+
+def check_batch(updates: list[Update], correct: bool) -> tuple[int, int]:
+    """Sum the middle values of the ordered updates, and of the corrected incorrect ones"""
+    ordered = corrected = 0
+    for update in updates:
+        if is_ordered(update, _worker_rules):
+            ordered += middle_value(update)
+        elif correct:
+            corrected += middle_value(correct_update(update, _worker_rules))
+    return ordered, corrected
+
+
+def check_updates_parallel(
+    rules: RuleIndex,
+    updates: list[Update],
+    correct: bool = True,
+    workers: int | None = None,
+    batch_size: int = 1000,
+) -> tuple[int, int]:
+    workers = worker_count(workers)
+    batches = (updates[i : i + batch_size] for i in range(0, len(updates), batch_size))
+    ordered = corrected = 0
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(rules,)
+    ) as executor:
+        check = partial(check_batch, correct=correct)
+        for o, c in imap_bounded(executor, check, batches, workers * 2):
+            ordered += o
+            corrected += c
+    return ordered, corrected
+
+
+def part1_parallel(workers: int | None = None) -> int:
+    rules, updates = parse_input(read_input())
+    return check_updates_parallel(rules, updates, correct=False, workers=workers)[0]
+
+
+def part2_parallel(workers: int | None = None) -> int:
+    rules, updates = parse_input(read_input())
+    return check_updates_parallel(rules, updates, workers=workers)[1]
 
 
 if __name__ == "__main__":
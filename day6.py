@@ -1,7 +1,13 @@
 import enum
 import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from typing import NamedTuple, Sequence, TypeVar
 
+from grid import NORTH, OUT, Grid
+from inputcache import cached_parse
+from parallel import imap_bounded, worker_count
+
 
 def read_input() -> str:
     if len(sys.argv) > 1:
@@ -68,6 +74,7 @@ class Guard(NamedTuple):
         return safe_get(safe_get(lab, row, ""), col)
 
 
+@cached_parse
 def parse_lab(data: str) -> tuple[list[str], Guard]:
     guard = None
     lab: list[str] = []
@@ -102,40 +109,37 @@ def part1() -> int:
     return len(visited)
 
 
-Point = tuple[int, int]
-Lab = dict[Point, str]
+Lab = Grid
+WALL = ord("#")
 
 
-def parse_data(input: str) -> Lab:
-    start = None
-    lab = {}
-    for r, line in enumerate(input.splitlines()):
-        for c, char in enumerate(line):
-            lab[(r, c)] = char
-            if char == "^":
-                start = (r, c)
-    assert start is not None
+@cached_parse
+def parse_data(input: str) -> tuple[Lab, int]:
+    lab = Grid.from_text(input)
+    start = lab.find("^")
+    assert start != -1
     return lab, start
 
 
-def move(lab: Lab, position: Point, direction: Point, obstacle: Point | None = None):
-    dr, dc = direction
-    next_position = (position[0] + dr, position[1] + dc)
-    if lab.get(next_position) == "#" or next_position == obstacle:
-        return move(lab, position, (dc, -dr), obstacle)
+def move(lab: Lab, position: int, direction: int, obstacle: int | None = None):
+    next_position = position + lab.offsets[direction]
+    if lab.cells[next_position] == WALL or next_position == obstacle:
+        return move(lab, position, (direction + 1) % 4, obstacle)
     return next_position, direction
 
 
-def traverse(lab: Lab, start: Point, obstacle: Point | None = None):
+def traverse(lab: Lab, start: int, obstacle: int | None = None):
     visited = set()
     path = set()
     location = start
-    direction = (-1, 0)
-    while location in lab:
-        if (location, direction) in path:
+    direction = NORTH
+    while lab.cells[location] != OUT:
+        # Each (location, direction) state packed into one int
+        state = location * 4 + direction
+        if state in path:
             return True
         visited.add(location)
-        path.add((location, direction))
+        path.add(state)
         location, direction = move(lab, location, direction, obstacle)
     return visited
 
@@ -146,6 +150,158 @@ def part2_revisited():
     return sum(traverse(lab, start, obs) is True for obs in path)
 
 
+# Part 2 again, without walking one step at a time. A jump table records, for every
+# cell and direction, where the guard stops walking that way: right in front of the
+# next obstacle, or just outside the lab. A run then only visits the turns.
+# The one extra obstacle is patched in on the fly: if it sits between a turn and
+# the next stop, the guard stops in front of it instead.
+
+
+def jump_table(lab: Lab) -> array:
+    """Where the guard stops walking from each cell, indexed by cell * 4 + direction"""
+    cells = lab.cells
+    # Stops are cell indices, so 32-bit entries are enough for any realistic lab
+    typecode = "i" if len(cells) < 2**31 else "q"
+    stops = array(typecode, [0]) * (4 * len(cells))
+    for direction, offset in enumerate(lab.offsets):
+        # Fill in each cell after the one beyond it, so that one is already known
+        order = range(len(cells)) if offset < 0 else range(len(cells) - 1, -1, -1)
+        for i in order:
+            if cells[i] == OUT or cells[i] == WALL:
+                continue
+            ahead = i + offset
+            if cells[ahead] == WALL:
+                stops[i * 4 + direction] = i
+            elif cells[ahead] == OUT:
+                stops[i * 4 + direction] = ahead
+            else:
+                stops[i * 4 + direction] = stops[ahead * 4 + direction]
+    return stops
+
+
+def loops(
+    lab: Lab,
+    stops: array,
+    seen: bytearray,
+    position: int,
+    direction: int,
+    obstacle: int,
+) -> bool:
+    """
+    Whether the guard, at position facing direction, gets stuck in a loop once an
+    obstacle is placed at obstacle. seen is a zeroed bitset of (cell, direction)
+    states, which is handed back zeroed.
+    """
+    cells = lab.cells
+    offsets = lab.offsets
+    turns = []
+    try:
+        while True:
+            offset = offsets[direction]
+            stop = stops[position * 4 + direction]
+            steps, off_line = divmod(obstacle - position, offset)
+            if not off_line and 0 < steps <= (stop - position) // offset:
+                stop = obstacle - offset
+            if cells[stop] == OUT:
+                return False
+            state = stop * 4 + direction
+            if seen[state]:
+                return True
+            seen[state] = 1
+            turns.append(state)
+            position = stop
+            direction = (direction + 1) % 4
+    finally:
+        for state in turns:
+            seen[state] = 0
+
+
+def first_steps(lab: Lab, start: int) -> dict[int, tuple[int, int]]:
+    """
+    For every cell on the guard's path but the start, the (position, direction)
+    the guard is in just before it first steps onto that cell
+    """
+    cells = lab.cells
+    seen = bytearray(4 * len(cells))
+    steps = {}
+    position, direction = start, NORTH
+    while True:
+        ahead, direction = move(lab, position, direction)
+        if cells[ahead] == OUT:
+            return steps
+        state = ahead * 4 + direction
+        if seen[state]:
+            raise ValueError("the guard never leaves the lab")
+        seen[state] = 1
+        if ahead != start and ahead not in steps:
+            steps[ahead] = position, direction
+        position = ahead
+
+
+def count_loops(lab: Lab, start: int) -> int:
+    """Count the places a new obstacle would trap the guard in a loop"""
+    stops = jump_table(lab)
+    seen = bytearray(4 * len(lab.cells))
+    # Only cells on the guard's path can change where it goes. Up to the first time
+    # the guard would reach the new obstacle its path is unchanged, so each check
+    # picks up from there instead of walking that part again.
+    return sum(
+        loops(lab, stops, seen, position, direction, obstacle)
+        for obstacle, (position, direction) in first_steps(lab, start).items()
+    )
+
+
+def part2():
+    lab, start = parse_data(read_input())
+    return count_loops(lab, start)
+
+
+# Parallel mode: every candidate obstacle is checked independently, so batches of
+# them are spread over a process pool. Each worker gets the lab and jump table once,
+# when it starts, and only reads from them.
+
+_worker_lab: Lab | None = None
+_worker_stops: array | None = None
+_worker_seen = bytearray()
+
+
+def _init_worker(lab: Lab, stops: array):
+    global _worker_lab, _worker_stops, _worker_seen
+    _worker_lab = lab
+    _worker_stops = stops
+    _worker_seen = bytearray(4 * len(lab.cells))
+
+
+def check_candidates(candidates: list[tuple[int, int, int]]) -> int:
+    """Count the (obstacle, position, direction) candidates that trap the guard"""
+    return sum(
+        loops(_worker_lab, _worker_stops, _worker_seen, position, direction, obstacle)
+        for obstacle, position, direction in candidates
+    )
+
+
+def count_loops_parallel(
+    lab: Lab, start: int, workers: int | None = None, batch_size: int = 256
+) -> int:
+    workers = worker_count(workers)
+    candidates = [
+        (obstacle, position, direction)
+        for obstacle, (position, direction) in first_steps(lab, start).items()
+    ]
+    batches = (
+        candidates[i : i + batch_size] for i in range(0, len(candidates), batch_size)
+    )
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(lab, jump_table(lab))
+    ) as executor:
+        return sum(imap_bounded(executor, check_candidates, batches, workers * 2))
+
+
+def part2_parallel(workers: int | None = None) -> int:
+    lab, start = parse_data(read_input())
+    return count_loops_parallel(lab, start, workers)
+
+
 def err(result: int):
     attempts = {
         1614: "strikes me as, perhaps, too high",
@@ -177,7 +333,7 @@ def err(result: int):
 
 
 if __name__ == "__main__":
-    result = part2_revisited()
+    result = part2()
     print(result, end="")
     print(err(result), end="\033[0m")
     print()
@@ -1,6 +1,18 @@
 import operator
+import pickle
+import statistics
 import sys
+import time
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from itertools import product
+from typing import Callable, NamedTuple, Sequence
+
+from inputcache import cached_parse
+from numeric import POWERS_OF_TEN
+from parallel import imap_bounded, worker_count
+from stream import input_lines
 
 
 def read_input() -> str:
@@ -10,19 +22,22 @@ def read_input() -> str:
     return sys.stdin.read().strip()
 
 
+def parse_row(line: str) -> tuple[int, list[int]]:
+    x, xs = line.split(": ")
+    return int(x), [int(y) for y in xs.split(" ")]
+
+
+@cached_parse
 def parse_input(data: str) -> list[tuple[int, list[int]]]:
-    return [
-        (int(x), [int(y) for y in xs.split(" ")])
-        for x, xs in [x.split(": ") for x in data.splitlines()]
-    ]
+    return [parse_row(line) for line in data.splitlines()]
 
 
-def debug_print(answer: int, row: list[int], ops: list):
-    print(f"{answer} = {row[0]}", end="")
-    for op, b in zip(ops, row[1:]):
-        o = "+" if op == operator.add else "*"
-        print(f" {o} {b}", end="")
-    print()
+def concat_shift(b: int) -> int:
+    """10 to the power of the number of digits in b"""
+    if b < POWERS_OF_TEN[-2]:
+        # bisect_right gives the number of digits, except for 0
+        return POWERS_OF_TEN[bisect_right(POWERS_OF_TEN, b) or 1]
+    return 10 ** len(str(b))
 
 
 def con(a: int, b: int) -> int:
@@ -31,28 +46,237 @@ def con(a: int, b: int) -> int:
     > For example, 12 || 345 would become 12345
     """
 
-    return a * 10 ** len(str(b)) + b
+    return a * concat_shift(b) + b
+
+
+# The operators an equation can use. Each one knows how to apply itself going
+# forwards, and how to undo itself for the backwards search: given the result and
+# the right-hand operand, undo returns the left-hand operand it must have had, or
+# None if there's no such number, or ANY if every number works (e.g. times 0).
+# Every operator must never make a non-negative number smaller, which is what lets
+# the search rule branches out early. To be used in the parallel mode, both
+# functions must be defined at the top level of a module (not lambdas or nested
+# functions), so they can be sent to the worker processes.
+
+ANY = object()
+
+
+class Operator(NamedTuple):
+    symbol: str
+    apply: Callable[[int, int], int]
+    undo: Callable[[int, int], int | None]
+
+
+def unadd(target: int, b: int) -> int | None:
+    return target - b if target >= b else None
+
+
+def unmul(target: int, b: int) -> int | None:
+    if b == 0:
+        return ANY if target == 0 else None
+    return target // b if target % b == 0 else None
+
+
+def uncon(target: int, b: int) -> int | None:
+    shift = concat_shift(b)
+    return target // shift if target % shift == b else None
+
+
+OPERATORS: dict[str, Operator] = {}
+
+
+def register(
+    symbol: str,
+    apply: Callable[[int, int], int],
+    undo: Callable[[int, int], int | None],
+) -> Operator:
+    """Add an operator to the registry, so it can be picked by symbol"""
+    op = Operator(symbol, apply, undo)
+    OPERATORS[symbol] = op
+    return op
+
+
+ADD = register("+", operator.add, unadd)
+MUL = register("*", operator.mul, unmul)
+CON = register("||", con, uncon)
+
+PART1_OPERATORS = (ADD, MUL)
+PART2_OPERATORS = (ADD, MUL, CON)
+
+
+def operators(*symbols: str) -> tuple[Operator, ...]:
+    return tuple(OPERATORS[symbol] for symbol in symbols)
+
+
+def debug_print(answer: int, row: list[int], ops: Sequence[Operator]):
+    print(f"{answer} = {row[0]}", end="")
+    for op, b in zip(ops, row[1:]):
+        print(f" {op.symbol} {b}", end="")
+    print()
 
 
-def possible_input(row: tuple[int, list[int]], ops=[]) -> bool:
-    for combo in product([operator.add, operator.mul] + ops, repeat=len(row[1]) - 1):
+def possible_input(
+    row: tuple[int, list[int]], ops: Sequence[Operator] = PART1_OPERATORS
+) -> bool:
+    for combo in product(ops, repeat=len(row[1]) - 1):
         v = row[1][0]
         for op, b in zip(combo, row[1][1:]):
-            v = op(v, b)
+            v = op.apply(v, b)
         if v == row[0]:
             # debug_print(v, row[1], combo)
             return True
     return False
 
 
+def solvable(
+    row: tuple[int, list[int]], ops: Sequence[Operator] = PART1_OPERATORS
+) -> bool:
+    """
+    Whether some choice of ops between the operands makes the row's equation true.
+
+    Rather than trying every combination, this works backwards from the answer,
+    undoing the last operand with each operator: subtracting it, dividing by it if
+    it divides evenly, stripping it off the end if the answer ends in its digits...
+    None of the operators make a number smaller, so most of those are ruled out
+    straight away. The values the rest of the row could still need to make are kept
+    in a set, so different ways of reaching the same value (like + 1 and * 1) are
+    only followed once, and the search stays small however long the row is.
+    """
+    answer, operands = row
+    targets = {answer}
+    for b in reversed(operands[1:]):
+        before = set()
+        for target in targets:
+            for op in ops:
+                value = op.undo(target, b)
+                if value is ANY:
+                    return True
+                if value is not None:
+                    before.add(value)
+        if not before:
+            return False
+        targets = before
+    return operands[0] in targets
+
+
 def part1():
     data = parse_input(read_input())
-    return sum(row[0] for row in data if possible_input(row))
+    return sum(row[0] for row in data if solvable(row))
 
 
 def part2():
     data = parse_input(read_input())
-    return sum(row[0] for row in data if possible_input(row, [con]))
+    return sum(row[0] for row in data if solvable(row, PART2_OPERATORS))
+
+
+# Streaming variants: every row is independent, so they can be checked
+# one at a time as they're read instead of parsing the whole file first.
+
+
+def part1_streaming():
+    rows = map(parse_row, input_lines())
+    return sum(row[0] for row in rows if solvable(row))
+
+
+def part2_streaming():
+    rows = map(parse_row, input_lines())
+    return sum(row[0] for row in rows if solvable(row, PART2_OPERATORS))
+
+
+# Parallel mode for big calibration files: rows are independent, so batches of them
+# are spread over a process pool. Each row is timed as well, to find the ones that
+# make the search work hard.
+
+
+def check_rows(
+    rows: list[tuple[int, list[int]]], ops: Sequence[Operator]
+) -> tuple[int, list[float]]:
+    """The calibration total of rows, and how long each row took to check"""
+    total = 0
+    times = []
+    for row in rows:
+        start = time.perf_counter()
+        if solvable(row, ops):
+            total += row[0]
+        times.append(time.perf_counter() - start)
+    return total, times
+
+
+def calibrate_parallel(
+    rows: list[tuple[int, list[int]]],
+    ops: Sequence[Operator],
+    workers: int | None = None,
+    batch_size: int = 500,
+) -> tuple[int, list[float]]:
+    """The calibration total of rows, and the time each row took, in row order"""
+    for op in ops:
+        try:
+            pickle.dumps(op)
+        except (pickle.PicklingError, AttributeError, TypeError) as e:
+            raise ValueError(
+                f"operator {op.symbol!r} can't be sent to worker processes; its "
+                "functions must be defined at the top level of a module"
+            ) from e
+    workers = worker_count(workers)
+    batches = (rows[i : i + batch_size] for i in range(0, len(rows), batch_size))
+    total = 0
+    times = []
+    with ProcessPoolExecutor(workers) as executor:
+        check = partial(check_rows, ops=ops)
+        for t, ts in imap_bounded(executor, check, batches, workers * 2):
+            total += t
+            times.extend(ts)
+    return total, times
+
+
+def row_time_stats(times: list[float]) -> dict[str, float]:
+    """Summarise per-row check times, including which row was slowest"""
+    if not times:
+        return {"rows": 0}
+    slowest = max(range(len(times)), key=times.__getitem__)
+    return {
+        "rows": len(times),
+        "total": sum(times),
+        "mean": statistics.fmean(times),
+        "median": statistics.median(times),
+        "max": times[slowest],
+        "slowest_row": slowest,
+    }
+
+
+def calibration_report(
+    symbols: Sequence[str] = ("+", "*"),
+    workers: int | None = None,
+    batch_size: int = 500,
+) -> dict:
+    """
+    Check the puzzle input in parallel with the registered operators named by symbols,
+    returning the calibration total and row_time_stats of the per-row check times
+    """
+    data = parse_input(read_input())
+    total, times = calibrate_parallel(data, operators(*symbols), workers, batch_size)
+    return {"total": total, "row_times": row_time_stats(times)}
+
+
+def print_report(report: dict) -> int:
+    """Print the row timings to stderr, leaving stdout be, and return the total"""
+    stats = report["row_times"]
+    if stats["rows"]:
+        print(
+            f"{stats['rows']} rows in {stats['total']:.3f}s: "
+            f"mean {stats['mean'] * 1e6:.1f}us, median {stats['median'] * 1e6:.1f}us, "
+            f"slowest {stats['max'] * 1e3:.2f}ms (row {stats['slowest_row']})",
+            file=sys.stderr,
+        )
+    return report["total"]
+
+
+def part1_parallel(workers: int | None = None):
+    return print_report(calibration_report(("+", "*"), workers))
+
+
+def part2_parallel(workers: int | None = None):
+    return print_report(calibration_report(("+", "*", "||"), workers))
 
 
 def check_attempts1(result):
@@ -1,8 +1,12 @@
 import sys
 from collections import defaultdict
 from itertools import combinations
+from math import gcd
 from types import new_class
 
+from inputcache import cached_parse
+from numeric import np, require_numpy
+
 
 def read_input() -> str:
     if len(sys.argv) > 1:
@@ -11,6 +15,7 @@ def read_input() -> str:
     return sys.stdin.read().strip()
 
 
+@cached_parse
 def parse_input(data: str) -> dict[str, list[tuple[int, int]]]:
     """Get a dict mapping antenna names to their locations."""
     antennae = defaultdict(list)
@@ -57,23 +62,15 @@ def calculate_antinodes(locs: list[tuple[int, int]]) -> set[tuple[int, int]]:
     return antinodes
 
 
-def part1() -> int:
+def part1(render: bool = False) -> int:
     input = read_input()
     lines = input.splitlines()
     data = parse_input(input)
-    antinodes = set()
-    for locs in data.values():
-        print(locs)
-        new_antinodes = calculate_antinodes(locs)
-        debug_print(input, new_antinodes)
-        antinodes |= new_antinodes
-    # Remove points outside the grid
-    antinodes = {
-        loc
-        for loc in antinodes
-        if 0 <= loc[0] < len(lines) and 0 <= loc[1] < len(lines[0])
-    }
-    return len(antinodes)
+    if render:
+        for locs in data.values():
+            print(locs)
+            debug_print(input, calculate_antinodes(locs))
+    return count_antinodes(data, len(lines), len(lines[0]))
 
 
 def calculate_antinodes2(
@@ -84,13 +81,16 @@ def calculate_antinodes2(
         antinodes.add(a)
         antinodes.add(b)
         x_dist, y_dist = taxicab_distances(a, b)
+        # Every grid position in line counts, not just multiples of the whole distance
+        g = gcd(x_dist, y_dist)
+        x_dist, y_dist = x_dist // g, y_dist // g
         x, y = a
         while 0 <= x < rows and 0 <= y < cols:
             x += x_dist
             y += y_dist
             if 0 <= x < rows and 0 <= y < cols:
                 antinodes.add((x, y))
-        x, y = b
+        x, y = a
         while 0 <= x < rows and 0 <= y < cols:
             x -= x_dist
             y -= y_dist
@@ -99,17 +99,180 @@ def calculate_antinodes2(
     return antinodes
 
 
-def part2() -> int:
+def part2(render: bool = False) -> int:
     input = read_input()
     lines = input.splitlines()
     data = parse_input(input)
+    if render:
+        for locs in data.values():
+            debug_print(input, calculate_antinodes2(locs, len(lines), len(lines[0])))
+    return count_antinodes(data, len(lines), len(lines[0]), harmonics=True)
 
-    antinodes = set()
-    for antenna, locs in data.items():
-        new_antinodes = calculate_antinodes2(locs, len(lines), len(lines[0]))
-        debug_print(input, new_antinodes)
-        antinodes |= new_antinodes
-    return len(antinodes)
+
+# The antinodes again, marked in one flat bitset with a byte per grid cell
+# (row * cols + col) instead of collected as sets of tuples per frequency.
+
+
+def steps_within(x: int, step: int, size: int, limit: int) -> int:
+    """
+    How many steps of step can be taken from x without leaving range(size), up to
+    limit (a step of 0 never leaves it)
+    """
+    if step > 0:
+        return min((size - 1 - x) // step, limit)
+    if step < 0:
+        return min(x // -step, limit)
+    return limit
+
+
+def mark_antinodes(
+    marked: bytearray, locs: list[tuple[int, int]], rows: int, cols: int
+):
+    for (r1, c1), (r2, c2) in combinations(locs, 2):
+        dr, dc = r1 - r2, c1 - c2
+        for r, c in ((r1 + dr, c1 + dc), (r2 - dr, c2 - dc)):
+            if 0 <= r < rows and 0 <= c < cols:
+                marked[r * cols + c] = 1
+
+
+def mark_harmonics(
+    marked: bytearray, locs: list[tuple[int, int]], rows: int, cols: int
+):
+    """
+    > an antinode occurs at any grid position exactly in line with at least two
+    > antennas of the same frequency, regardless of distance.
+
+    The step between a pair is divided by its gcd so that every grid position on the
+    line is hit, not just whole multiples of the distance between the pair. Each line
+    is then one strided slice of the bitset.
+    """
+    # No line has more than max(rows, cols) cells on the map
+    limit = max(rows, cols)
+    ones = memoryview(b"\x01" * limit)
+    for (r1, c1), (r2, c2) in combinations(locs, 2):
+        dr, dc = r1 - r2, c1 - c2
+        g = gcd(dr, dc)
+        dr, dc = dr // g, dc // g
+        # Point the step forwards through the bitset
+        if dr < 0 or (dr == 0 and dc < 0):
+            dr, dc = -dr, -dc
+        back = min(
+            steps_within(r1, -dr, rows, limit), steps_within(c1, -dc, cols, limit)
+        )
+        ahead = min(
+            steps_within(r1, dr, rows, limit), steps_within(c1, dc, cols, limit)
+        )
+        step = dr * cols + dc
+        start = (r1 * cols + c1) - back * step
+        count = back + ahead + 1
+        marked[start : start + count * step : step] = ones[:count]
+
+
+def count_antinodes(
+    data: dict[str, list[tuple[int, int]]],
+    rows: int,
+    cols: int,
+    harmonics: bool = False,
+) -> int:
+    marked = bytearray(rows * cols)
+    mark = mark_harmonics if harmonics else mark_antinodes
+    for locs in data.values():
+        mark(marked, locs, rows, cols)
+    return marked.count(1)
+
+
+# NumPy variants: every pair of antennas of a frequency is generated as a pair of
+# index arrays, a block of pairs at a time, and their antinodes are worked out all at
+# once as linear indices (row * cols + col). Those are deduplicated by setting them
+# in a boolean grid, like the bitset above; np.unique would sort (or hash) every
+# antinode found, which costs far more when most of them are repeats.
+
+POINT_BUDGET = 1 << 22  # Roughly how many antinodes to generate in one go
+
+
+def pair_blocks(n: int, max_pairs: int):
+    """Every pair (i, j) with i < j < n as two index arrays, a few rows at a time"""
+    block = max(1, max_pairs // max(n, 1))
+    for start in range(0, n - 1, block):
+        stop = min(start + block, n - 1)
+        i, j = np.triu_indices(stop - start, 1, n - start)
+        yield i + start, j + start
+
+
+def steps_within_array(
+    x: "np.ndarray", step: "np.ndarray", size: int, limit: int
+) -> "np.ndarray":
+    """steps_within for arrays of positions and steps"""
+    steps = np.full(x.shape, limit, dtype=np.int64)
+    up, down = step > 0, step < 0
+    steps[up] = (size - 1 - x[up]) // step[up]
+    steps[down] = x[down] // -step[down]
+    return np.minimum(steps, limit)
+
+
+def antinodes_of_pairs(
+    a: "np.ndarray", b: "np.ndarray", rows: int, cols: int, harmonics: bool
+) -> "np.ndarray":
+    """The linear indices of the antinodes of each pair of antennas a[k], b[k]"""
+    d = a - b
+    if not harmonics:
+        points = np.concatenate((a + d, b - d))
+        r, c = points[:, 0], points[:, 1]
+        inside = (0 <= r) & (r < rows) & (0 <= c) & (c < cols)
+        return r[inside] * cols + c[inside]
+
+    d //= np.gcd(d[:, 0], d[:, 1])[:, None]
+    r, c = a[:, 0], a[:, 1]
+    dr, dc = d[:, 0], d[:, 1]
+    limit = max(rows, cols)
+    back = np.minimum(
+        steps_within_array(r, -dr, rows, limit),
+        steps_within_array(c, -dc, cols, limit),
+    )
+    ahead = np.minimum(
+        steps_within_array(r, dr, rows, limit),
+        steps_within_array(c, dc, cols, limit),
+    )
+    # Each pair has a different number of multiples of its step on the map, so rather
+    # than broadcasting over a fixed range of multiples (mostly off the map), lay them
+    # out back to back: pair k gets the multiples -back[k]..ahead[k]
+    counts = back + ahead + 1
+    firsts = np.cumsum(counts) - counts
+    multiples = np.arange(counts.sum()) - np.repeat(firsts + back, counts)
+    steps = np.repeat(dr * cols + dc, counts)
+    return np.repeat(r * cols + c, counts) + multiples * steps
+
+
+def count_antinodes_numpy(
+    data: dict[str, list[tuple[int, int]]],
+    rows: int,
+    cols: int,
+    harmonics: bool = False,
+) -> int:
+    require_numpy("the NumPy variants of day 8")
+    marked = np.zeros(rows * cols, dtype=bool)
+    # A pair has at most max(rows, cols) antinodes in line with it
+    per_pair = max(rows, cols) if harmonics else 2
+    for locs in data.values():
+        antennas = np.array(locs, dtype=np.int64).reshape(-1, 2)
+        for i, j in pair_blocks(len(antennas), POINT_BUDGET // per_pair):
+            a, b = antennas[i], antennas[j]
+            marked[antinodes_of_pairs(a, b, rows, cols, harmonics)] = True
+    return int(np.count_nonzero(marked))
+
+
+def part1_numpy() -> int:
+    input = read_input()
+    lines = input.splitlines()
+    return count_antinodes_numpy(parse_input(input), len(lines), len(lines[0]))
+
+
+def part2_numpy() -> int:
+    input = read_input()
+    lines = input.splitlines()
+    return count_antinodes_numpy(
+        parse_input(input), len(lines), len(lines[0]), harmonics=True
+    )
 
 
 if __name__ == "__main__":
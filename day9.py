@@ -1,6 +1,9 @@
 import sys
+from heapq import heappop, heappush
 from typing import NamedTuple
 
+from inputcache import cached_parse
+
 
 def read_input():
     if len(sys.argv) == 2:
@@ -9,6 +12,7 @@ def read_input():
     return sys.stdin.read().strip()
 
 
+@cached_parse
 def parse_input(data) -> list[int]:
     block_id = 0
     blocks = []
@@ -47,13 +51,63 @@ def checksum(blocks: list[int]) -> int:
     return sum(i * block for i, block in enumerate(blocks) if block != -1)
 
 
-def part1():
+def part1_naive():
     data = read_input()
     blocks = parse_input(data)
     compacted = compact(blocks)
     return checksum(compacted)
 
 
+# Part 1 again, as runs of blocks rather than single blocks. Each run's checksum is
+# an arithmetic series, so it can be added up without listing the blocks.
+
+
+def run_checksum(block_id: int, start: int, length: int) -> int:
+    """The checksum of length blocks of block_id starting at position start"""
+    # block_id * (start + (start + 1) + ... + (start + length - 1))
+    return block_id * (length * start + length * (length - 1) // 2)
+
+
+def compact_checksum(disk_map: str) -> int:
+    """
+    The checksum after compacting, worked out straight from the disk map.
+
+    Reads files off the front of the map in place, and fills each free span from the
+    file at the back, one run of blocks at a time, so no blocks are ever expanded.
+    """
+    total = 0
+    position = 0
+    # The file being moved from the back, and how many of its blocks are left
+    back = len(disk_map) - 1
+    back -= back % 2
+    back_left = int(disk_map[back]) if back >= 0 else 0
+    front = 0
+    while front < back:
+        length = int(disk_map[front])
+        if front % 2 == 0:
+            total += run_checksum(front // 2, position, length)
+            position += length
+        else:
+            while length and front < back:
+                moved = min(length, back_left)
+                total += run_checksum(back // 2, position, moved)
+                position += moved
+                length -= moved
+                back_left -= moved
+                if not back_left:
+                    back -= 2
+                    back_left = int(disk_map[back])
+        front += 1
+    if front == back:
+        # Whatever is left of the last file to be moved stays where it is
+        total += run_checksum(back // 2, position, back_left)
+    return total
+
+
+def part1():
+    return compact_checksum(read_input())
+
+
 class Runblock(NamedTuple):
     length: int
     block_id: int
@@ -74,6 +128,7 @@ def debug_print_runblocks(blocks: list[Runblock]):
     debug_print(expand(blocks))
 
 
+@cached_parse
 def parse_run_length(data: str) -> list[Runblock]:
     """Parse the run-length encoded data into tuples of run length and block id"""
     block_id = 0
@@ -132,7 +187,7 @@ def defrag(blocks: list[Runblock]) -> list[Runblock]:
     return blocks
 
 
-def part2():
+def part2_naive():
     data = read_input()
     blocks = parse_run_length(data)
     compacted = defrag(blocks)
@@ -140,5 +195,57 @@ def part2():
     return checksum(expanded)
 
 
+# Part 2 again, without shuffling a list of blocks around. Free spans are at most 9
+# blocks long, so they're kept in one min-heap of start positions per length: the
+# leftmost span a file fits in is the smallest start among the heaps for its length
+# and up. The checksum of each file is added up as it's placed, with run_checksum.
+
+
+@cached_parse
+def parse_layout(data: str) -> tuple[list[tuple[int, int]], list[list[int]]]:
+    """
+    The (start, length) of every file, by id, and the starts of the free spans of
+    each length, as heaps indexed by length
+    """
+    files = []
+    spans: list[list[int]] = [[] for _ in range(10)]
+    position = 0
+    for i, char in enumerate(data):
+        length = int(char)
+        if i % 2 == 0:
+            files.append((position, length))
+        elif length:
+            # Starts only go up, so each list is already a heap
+            spans[length].append(position)
+        position += length
+    return files, spans
+
+
+def defrag_checksum(files: list[tuple[int, int]], spans: list[list[int]]) -> int:
+    """Move every file to the leftmost free span it fits in, returning the checksum"""
+    total = 0
+    for block_id in range(len(files) - 1, -1, -1):
+        start, length = files[block_id]
+        best = None
+        for size in range(max(length, 1), 10):
+            heap = spans[size]
+            if heap and heap[0] < start and (best is None or heap[0] < spans[best][0]):
+                best = size
+        if best is not None:
+            span = heappop(spans[best])
+            if best > length:
+                heappush(spans[best - length], span + length)
+            # The space the file leaves behind is right of every file still to
+            # move, so it can never be used and isn't added back
+            start = span
+        total += run_checksum(block_id, start, length)
+    return total
+
+
+def part2():
+    files, spans = parse_layout(read_input())
+    return defrag_checksum(files, spans)
+
+
 if __name__ == "__main__":
     print(part2())
@@ -0,0 +1,112 @@
+"""
+A compact 2D grid for the map-shaped puzzles.
+
+Cells are single bytes stored row-major in one flat bytearray, and a cell is
+addressed by its integer index into that array rather than an (r, c) tuple.
+The grid is surrounded by `pad` rows and columns of OUT, so stepping off the
+edge lands on a cell that can simply be compared against instead of needing a
+bounds check:
+
+    grid = Grid.from_text(data)
+    for offset in grid.offsets:
+        if grid.cells[i + offset] == ord("#"):
+            ...
+
+Moving up to `pad` cells in any direction from a real cell is always safe.
+"""
+
+from typing import Iterator
+
+OUT = 0  # The value of every padding cell
+
+NORTH, EAST, SOUTH, WEST = range(4)
+
+
+class Grid:
+    __slots__ = ("rows", "cols", "pad", "stride", "cells", "offsets")
+
+    def __init__(self, rows: int, cols: int, fill: str = ".", pad: int = 1):
+        self.rows = rows
+        self.cols = cols
+        self.pad = pad
+        self.stride = cols + 2 * pad
+        self.cells = bytearray(self.stride * (rows + 2 * pad))
+        # Offsets of the four neighbours, clockwise from north
+        self.offsets = (-self.stride, 1, self.stride, -1)
+        if fill:
+            row = fill.encode() * cols
+            for r in range(rows):
+                start = self.index(r, 0)
+                self.cells[start : start + cols] = row
+
+    @classmethod
+    def from_text(cls, text: str, pad: int = 1) -> "Grid":
+        lines = text.splitlines()
+        grid = cls(len(lines), len(lines[0]) if lines else 0, fill="", pad=pad)
+        for r, line in enumerate(lines):
+            if len(line) != grid.cols:
+                raise ValueError(
+                    f"row {r} has {len(line)} cells, expected {grid.cols}"
+                )
+            start = grid.index(r, 0)
+            grid.cells[start : start + grid.cols] = line.encode()
+        return grid
+
+    def __getstate__(self):
+        return self.rows, self.cols, self.pad, bytes(self.cells)
+
+    def __setstate__(self, state):
+        rows, cols, pad, cells = state
+        self.__init__(rows, cols, fill="", pad=pad)
+        self.cells[:] = cells
+
+    def copy(self) -> "Grid":
+        grid = Grid(self.rows, self.cols, fill="", pad=self.pad)
+        grid.cells[:] = self.cells
+        return grid
+
+    def index(self, r: int, c: int) -> int:
+        return (r + self.pad) * self.stride + c + self.pad
+
+    def coords(self, i: int) -> tuple[int, int]:
+        r, c = divmod(i, self.stride)
+        return r - self.pad, c - self.pad
+
+    def offset(self, dr: int, dc: int) -> int:
+        """The index offset of a (dr, dc) step."""
+        return dr * self.stride + dc
+
+    def inbounds(self, i: int) -> bool:
+        r, c = self.coords(i)
+        return 0 <= r < self.rows and 0 <= c < self.cols
+
+    def __getitem__(self, i: int) -> str:
+        return chr(self.cells[i])
+
+    def __setitem__(self, i: int, value: str):
+        self.cells[i] = ord(value)
+
+    def positions(self) -> Iterator[int]:
+        """Every index inside the grid, row by row."""
+        for r in range(self.rows):
+            start = self.index(r, 0)
+            yield from range(start, start + self.cols)
+
+    def find(self, value: str) -> int:
+        """The index of the first cell holding value, or -1."""
+        return self.cells.find(value.encode())
+
+    def find_all(self, value: str) -> list[int]:
+        found = []
+        target = value.encode()
+        i = self.cells.find(target)
+        while i != -1:
+            found.append(i)
+            i = self.cells.find(target, i + 1)
+        return found
+
+    def to_text(self) -> str:
+        return "\n".join(
+            self.cells[self.index(r, 0) : self.index(r, self.cols)].decode()
+            for r in range(self.rows)
+        )
@@ -0,0 +1,161 @@
+"""
+Parse-once cache for puzzle input.
+
+Decorate a day's parser with `@cached_parse` and calling it again with the same
+input text (e.g. part1 followed by part2, or repeated runs in runner.py) reuses
+the first parse instead of redoing it.
+
+Entries are keyed on a hash of the input text, the parser and the source of the
+module it lives in, so editing a day invalidates its entries. Results are kept
+pickled and every hit unpickles a fresh copy, which means a part that mutates
+its parsed input (day 5 reorders updates, day 15 moves boxes around) can't
+affect the next caller.
+
+The pickles kept in memory are limited to a byte budget (`set_memory_budget`),
+dropping the least recently used first, so a huge input doesn't stay pinned.
+
+Set AOC_CACHE_DIR (or call `set_cache_dir`) to also keep the pickles on disk,
+so separate runs over the same input skip parsing too.
+"""
+
+import functools
+import hashlib
+import os
+import pickle
+import sys
+from collections import OrderedDict
+from pathlib import Path
+
+_memory: OrderedDict[str, bytes] = OrderedDict()
+_memory_bytes = 0
+_memory_budget = 32 << 20
+_cache_dir: Path | None = None
+_enabled = True
+_MISS = object()
+
+
+def set_cache_dir(path: str | os.PathLike | None):
+    """Store parsed input on disk in `path` (None turns the disk cache off)."""
+    global _cache_dir
+    _cache_dir = Path(path) if path is not None else None
+    if _cache_dir is not None:
+        _cache_dir.mkdir(parents=True, exist_ok=True)
+
+
+def set_enabled(enabled: bool):
+    """Turn caching on or off globally, e.g. to time cold parses."""
+    global _enabled
+    _enabled = enabled
+
+
+def set_memory_budget(nbytes: int):
+    """Keep at most nbytes of pickled results in memory."""
+    global _memory_budget
+    _memory_budget = nbytes
+    _evict()
+
+
+def clear():
+    """Forget everything cached in memory (the disk cache is left alone)."""
+    global _memory_bytes
+    _memory.clear()
+    _memory_bytes = 0
+
+
+def _remember(key: str, blob: bytes):
+    global _memory_bytes
+    if len(blob) > _memory_budget:
+        return
+    _forget(key)
+    _memory[key] = blob
+    _memory_bytes += len(blob)
+    _evict()
+
+
+def _forget(key: str):
+    global _memory_bytes
+    blob = _memory.pop(key, None)
+    if blob is not None:
+        _memory_bytes -= len(blob)
+
+
+def _evict():
+    global _memory_bytes
+    while _memory_bytes > _memory_budget:
+        _, blob = _memory.popitem(last=False)
+        _memory_bytes -= len(blob)
+
+
+def _source_digest(func) -> str:
+    module = sys.modules.get(func.__module__)
+    source = getattr(module, "__file__", None)
+    try:
+        with open(source, "rb") as f:
+            return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+    except (OSError, TypeError):
+        # No source to hash (e.g. defined interactively); fall back to the bytecode
+        return hashlib.blake2b(func.__code__.co_code, digest_size=16).hexdigest()
+
+
+def _load(key: str):
+    blob = _memory.get(key)
+    if blob is not None:
+        _memory.move_to_end(key)
+    elif _cache_dir is not None:
+        try:
+            blob = (_cache_dir / f"{key}.pickle").read_bytes()
+        except OSError:
+            return _MISS
+        _remember(key, blob)
+    if blob is None:
+        return _MISS
+    try:
+        return pickle.loads(blob)
+    except Exception:
+        # Stale or corrupt entry; forget it and parse again
+        _forget(key)
+        if _cache_dir is not None:
+            (_cache_dir / f"{key}.pickle").unlink(missing_ok=True)
+        return _MISS
+
+
+def _store(key: str, value):
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    _remember(key, blob)
+    if _cache_dir is not None:
+        path = _cache_dir / f"{key}.pickle"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(blob)
+        tmp.replace(path)
+
+
+def cached_parse(func):
+    """Cache `func(data)` on the content of `data`."""
+    source = None
+
+    @functools.wraps(func)
+    def wrapper(data, *args, **kwargs):
+        nonlocal source
+        if not _enabled or args or kwargs or not isinstance(data, str):
+            return func(data, *args, **kwargs)
+        if source is None:
+            source = _source_digest(func)
+        h = hashlib.blake2b(digest_size=20)
+        for part in (func.__module__, func.__qualname__, source):
+            h.update(part.encode())
+            h.update(b"\0")
+        h.update(data.encode())
+        key = h.hexdigest()
+
+        value = _load(key)
+        if value is _MISS:
+            value = func(data)
+            # The cache keeps its own pickled copy, so handing this one out is safe
+            _store(key, value)
+        return value
+
+    return wrapper
+
+
+if os.environ.get("AOC_CACHE_DIR"):
+    set_cache_dir(os.environ["AOC_CACHE_DIR"])
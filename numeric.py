@@ -0,0 +1,28 @@
+"""
+Number-crunching helpers shared between the days: the optional NumPy import
+behind the NumPy variants, and counting decimal digits without going through str.
+"""
+
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the NumPy variants need it
+    np = None
+
+
+def require_numpy(what: str) -> None:
+    """Raise ImportError, saying what needs it, if NumPy isn't installed."""
+    if np is None:
+        raise ImportError(f"numpy must be installed for {what}")
+
+
+# Powers of ten, for counting and splitting digits without going through str
+POWERS_OF_TEN = [10**i for i in range(40)]
+
+
+def digits(x: int) -> int:
+    """The number of decimal digits in x, for x >= 0."""
+    if x < POWERS_OF_TEN[-1]:
+        return max(bisect_right(POWERS_OF_TEN, x), 1)
+    return len(str(x))
@@ -0,0 +1,40 @@
+"""
+Helpers for fanning independent pieces of a puzzle out to a process pool.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Executor
+from typing import Callable, Iterable, Iterator, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def worker_count(workers: int | None = None) -> int:
+    """The number of worker processes to use, defaulting to one per CPU."""
+    if workers is None:
+        return os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    return workers
+
+
+def imap_bounded(
+    executor: Executor,
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    max_pending: int,
+) -> Iterator[R]:
+    """
+    Like executor.map, but results come back in order while only max_pending
+    items are submitted at a time, so a long (or streamed) iterable of work is
+    never pulled into memory all at once.
+    """
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
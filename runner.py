@@ -0,0 +1,309 @@
+"""
+Run and benchmark the day*.py solutions.
+
+    python runner.py 1 5 12 --input inputs/day{day}.txt --parts 1 2 --repeat 5
+
+Each selected part is run against each input file `--repeat` times and a JSON
+report with wall time, per-phase time (read_input / parse / solve) and peak
+memory is written to stdout (or `--output`).
+
+Phases are measured by temporarily wrapping the module's `read_input` and
+`parse_*` functions, so the solutions themselves don't need to know about the
+runner. Whatever is left of the wall time is attributed to solving.
+"""
+
+import argparse
+import contextlib
+import functools
+import importlib
+import io
+import json
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import GeneratorType, ModuleType
+
+import inputcache
+
+ROOT = Path(__file__).resolve().parent
+
+PART_ALIASES = {
+    "1": ("part1", "part_1"),
+    "2": ("part2", "part_2", "part2_revisited"),
+}
+
+
+def discover_days() -> dict[int, str]:
+    """Map day numbers to module names for every dayN.py next to this file."""
+    days = {}
+    for path in ROOT.glob("day*.py"):
+        match = re.fullmatch(r"day(\d+)", path.stem)
+        if match:
+            days[int(match.group(1))] = path.stem
+    return dict(sorted(days.items()))
+
+
+def resolve_part(module: ModuleType, part: str):
+    """Find the function for a part, e.g. "1" -> part1 (or part_1 in day 1)."""
+    for name in PART_ALIASES.get(part, (part,)):
+        func = getattr(module, name, None)
+        if callable(func):
+            return name, func
+    return None, None
+
+
+class PhaseTimer:
+    """Accumulate time spent in the read_input and parse phases of a run."""
+
+    def __init__(self):
+        self.totals = {"read_input": 0.0, "parse": 0.0}
+        self.depth = 0
+
+    def reset(self):
+        for phase in self.totals:
+            self.totals[phase] = 0.0
+
+    def _timed(self, phase, call):
+        # Only the outermost phase is timed, so parsers calling each other
+        # (or read_input) aren't counted twice.
+        if self.depth:
+            return call()
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            return call()
+        finally:
+            self.totals[phase] += time.perf_counter() - start
+            self.depth -= 1
+
+    def _timed_generator(self, phase, gen):
+        while True:
+            try:
+                item = self._timed(phase, lambda: next(gen))
+            except StopIteration:
+                return
+            yield item
+
+    def wrap(self, phase: str, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = self._timed(phase, lambda: func(*args, **kwargs))
+            if isinstance(result, GeneratorType):
+                # Lazy parsers (day 2, day 11) do their work as they're consumed
+                return self._timed_generator(phase, result)
+            return result
+
+        return wrapper
+
+
+@contextlib.contextmanager
+def instrumented(module: ModuleType, timer: PhaseTimer):
+    """Temporarily swap the module's input functions for timed versions."""
+    originals = {}
+    for name, value in vars(module).items():
+        if not callable(value) or getattr(value, "__module__", None) != module.__name__:
+            continue
+        if name == "read_input" or name.startswith("parse_"):
+            originals[name] = value
+    try:
+        for name, func in originals.items():
+            phase = "read_input" if name == "read_input" else "parse"
+            setattr(module, name, timer.wrap(phase, func))
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(module, name, func)
+
+
+@contextlib.contextmanager
+def puzzle_input(module: ModuleType, path: Path):
+    """Point sys.argv and sys.stdin at the input file, the way the days expect."""
+    argv, stdin = sys.argv, sys.stdin
+    with open(path) as f:
+        sys.argv = [module.__file__, str(path)]
+        sys.stdin = f
+        try:
+            yield
+        finally:
+            sys.argv, sys.stdin = argv, stdin
+
+
+def run_once(module: ModuleType, func, path: Path, timer: PhaseTimer):
+    """Run a part once, returning its answer, wall time and captured stdout."""
+    timer.reset()
+    out = io.StringIO()
+    with puzzle_input(module, path), contextlib.redirect_stdout(out):
+        start = time.perf_counter()
+        answer = func()
+        wall = time.perf_counter() - start
+    return answer, wall, out.getvalue()
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    return {
+        "min": min(values),
+        "mean": statistics.fmean(values),
+        "max": max(values),
+    }
+
+
+def benchmark(
+    day: int,
+    module_name: str,
+    part: str,
+    path: Path,
+    repeat: int,
+    memory: bool,
+) -> dict:
+    result = {"day": day, "part": part, "input": str(path)}
+    module = importlib.import_module(module_name)
+    name, func = resolve_part(module, part)
+    if func is None:
+        result["error"] = f"day {day} has no part {part!r}"
+        return result
+    result["part"] = name
+    if not path.is_file():
+        result["error"] = f"no such input file: {path}"
+        return result
+
+    timer = PhaseTimer()
+    runs = []
+    try:
+        with instrumented(module, timer):
+            for _ in range(repeat):
+                answer, wall, stdout = run_once(module, func, path, timer)
+                read, parse = timer.totals["read_input"], timer.totals["parse"]
+                runs.append(
+                    {
+                        "wall": wall,
+                        "read_input": read,
+                        "parse": parse,
+                        "solve": max(wall - read - parse, 0.0),
+                    }
+                )
+            if memory:
+                # Separate run, since tracing allocations skews the timings
+                tracemalloc.start()
+                try:
+                    run_once(module, func, path, timer)
+                    result["peak_memory"] = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    if answer is None and stdout.strip():
+        # Some days print their answer rather than returning it
+        answer = stdout.strip().splitlines()[-1]
+    result["answer"] = answer
+    result["runs"] = runs
+    for phase in ("wall", "read_input", "parse", "solve"):
+        result[phase] = summarize([run[phase] for run in runs])
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "days",
+        nargs="*",
+        type=int,
+        help="days to run (default: every dayN.py found)",
+    )
+    parser.add_argument(
+        "-i",
+        "--input",
+        action="append",
+        help="input file; {day} is replaced with the day number. "
+        "May be given more than once. (default: inputs/day{day}.txt)",
+    )
+    parser.add_argument(
+        "-p",
+        "--parts",
+        nargs="+",
+        default=["1", "2"],
+        help="parts to run: 1, 2 or a function name like re_part1 (default: 1 2)",
+    )
+    parser.add_argument("-n", "--repeat", type=int, default=1)
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="skip the extra tracemalloc run used to measure peak memory",
+    )
+    parser.add_argument(
+        "--cold",
+        action="store_true",
+        help="don't use the parse cache (in memory or on disk), "
+        "so each run pays for parsing",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="also keep parsed input on disk here (see inputcache.py)",
+    )
+    parser.add_argument("-o", "--output", help="write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    available = discover_days()
+    days = args.days or list(available)
+    unknown = [day for day in days if day not in available]
+    if unknown:
+        raise SystemExit(f"unknown days: {unknown}")
+    if args.repeat < 1:
+        raise SystemExit("--repeat must be at least 1")
+    inputs = args.input or ["inputs/day{day}.txt"]
+
+    sys.path.insert(0, str(ROOT))
+    if args.cache_dir:
+        inputcache.set_cache_dir(args.cache_dir)
+    if args.cold:
+        # Skip the disk cache as well as the in-memory one, so every run parses
+        inputcache.set_enabled(False)
+    results = []
+    for day in days:
+        for template in inputs:
+            path = Path(template.format(day=day))
+            for part in args.parts:
+                result = benchmark(
+                    day,
+                    available[day],
+                    part,
+                    path,
+                    args.repeat,
+                    args.memory,
+                )
+                results.append(result)
+                print(
+                    f"day {day} {result['part']} {path}: "
+                    + (
+                        result["error"]
+                        if "error" in result
+                        else f"{result['wall']['mean']:.4f}s"
+                    ),
+                    file=sys.stderr,
+                )
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "cold": args.cold,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, default=str)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Streaming input for the puzzles whose input is one record per line.
+
+`read_input()` in each day slurps the whole file, which is fine for the real
+puzzle input but not for multi-GB generated ones. `input_lines()` yields the
+same lines one at a time instead, memory-mapping the file when one is given
+on the command line and reading stdin in fixed-size chunks otherwise, so
+memory stays bounded by the longest line.
+"""
+
+import mmap
+import os
+import sys
+from typing import BinaryIO, Iterator
+
+CHUNK_SIZE = 1 << 20
+
+
+def _mapped_lines(
+    path: str, start: int = 0, end: int | None = None
+) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files can't be mapped
+            return
+        with mm:
+            size = len(mm) if end is None else min(end, len(mm))
+            while start < size:
+                newline = mm.find(b"\n", start, size)
+                if newline == -1:
+                    newline = size
+                yield mm[start:newline]
+                start = newline + 1
+
+
+def _chunked_lines(f: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    carry = b""
+    while chunk := f.read(chunk_size):
+        lines = (carry + chunk).split(b"\n")
+        # The last piece may be the start of a line that continues in the next chunk
+        carry = lines.pop()
+        yield from lines
+    if carry:
+        yield carry
+
+
+def iter_lines(
+    path: str | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[str]:
+    """
+    Yield the lines of path (or stdin) one at a time, without line endings.
+    Blank lines are skipped, like splitlines() on stripped input would.
+
+    For a file, only the lines in the byte range [start, end) are read;
+    see line_ranges.
+    """
+    if path is not None:
+        raw = _mapped_lines(path, start, end)
+    else:
+        raw = _chunked_lines(sys.stdin.buffer, chunk_size)
+    for line in raw:
+        line = line.rstrip(b"\r")
+        if line.strip():
+            yield line.decode()
+
+
+def input_lines(chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """Stream the puzzle input from the file named on the command line, or stdin."""
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    return iter_lines(path, chunk_size)
+
+
+def line_ranges(path: str, parts: int) -> list[tuple[int, int]]:
+    """
+    Split the file at path into at most `parts` (start, end) byte ranges of roughly
+    equal size, each starting at the beginning of a line, for processing in parallel.
+    """
+    size = os.path.getsize(path)
+    if not size:
+        return []
+    bounds = [0]
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    with mm:
+        for i in range(1, parts):
+            newline = mm.find(b"\n", max(size * i // parts, bounds[-1]))
+            if newline == -1:
+                break
+            if newline + 1 > bounds[-1]:
+                bounds.append(newline + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if start < end]